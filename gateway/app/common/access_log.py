@@ -0,0 +1,204 @@
+import atexit
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import random
+import sys
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+ACCESS_LOGGER_NAME = "gateway.access"
+
+
+class StructuredFormatter(logging.Formatter):
+    """액세스 레코드는 JSON 한 줄로, 나머지는 일반 텍스트로 포맷"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        access = getattr(record, "access", None)
+        if access is None:
+            return super().format(record)
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, tz=timezone.utc).isoformat(),
+            "level": record.levelname,
+            "type": "access",
+        }
+        entry.update(access)
+        return json.dumps(entry, ensure_ascii=False, separators=(",", ":"))
+
+
+class DroppingQueueHandler(logging.handlers.QueueHandler):
+    """큐가 차면 블로킹하지 않고 레코드를 버리는 QueueHandler
+
+    soft_limit를 넘으면 WARNING 미만 레코드만 버리고, 그 위의 남은 자리는
+    경고/오류 레코드용으로 남겨 둡니다.
+    """
+
+    def __init__(self, log_queue: queue.Queue, soft_limit: Optional[int] = None):
+        super().__init__(log_queue)
+        self.soft_limit = soft_limit
+        self.dropped = 0
+
+    def enqueue(self, record: logging.LogRecord):
+        if (record.levelno < logging.WARNING and self.soft_limit is not None
+                and self.queue.qsize() >= self.soft_limit):
+            self.dropped += 1
+            return
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+class BatchingQueueListener:
+    """큐에 쌓인 로그 레코드를 별도 스레드에서 묶어서 기록"""
+
+    _sentinel = None
+
+    def __init__(self, log_queue: queue.Queue, stream=None, formatter: Optional[logging.Formatter] = None,
+                 batch_size: int = 256, flush_interval: float = 0.5):
+        self.queue = log_queue
+        self.stream = stream or sys.stderr
+        self.formatter = formatter or StructuredFormatter()
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._run, name="log-writer", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        if self._thread is None:
+            return
+        self.queue.put(self._sentinel)
+        self._thread.join()
+        self._thread = None
+
+    def _run(self):
+        while True:
+            try:
+                record = self.queue.get(timeout=self.flush_interval)
+            except queue.Empty:
+                continue
+            batch: List[logging.LogRecord] = []
+            stop = record is self._sentinel
+            if not stop:
+                batch.append(record)
+            # 대기 중인 레코드를 batch_size 만큼 한 번에 꺼냄
+            while not stop and len(batch) < self.batch_size:
+                try:
+                    record = self.queue.get_nowait()
+                except queue.Empty:
+                    break
+                if record is self._sentinel:
+                    stop = True
+                else:
+                    batch.append(record)
+            if batch:
+                self._write(batch)
+            if stop:
+                return
+
+    def _write(self, batch: List[logging.LogRecord]):
+        lines = []
+        for record in batch:
+            try:
+                lines.append(self.formatter.format(record))
+            except Exception:
+                continue
+        try:
+            self.stream.write("\n".join(lines) + "\n")
+            self.stream.flush()
+        except Exception:
+            pass
+
+
+class AccessLogger:
+    """프록시 요청별 구조화 액세스 로그 (성공 요청은 샘플링, 오류는 항상 기록)"""
+
+    def __init__(self, sample_rate: float = 1.0):
+        self.logger = logging.getLogger(ACCESS_LOGGER_NAME)
+        self.sample_rate = max(0.0, min(1.0, sample_rate))
+
+    def should_log(self, status: int, error: Optional[str] = None) -> bool:
+        if error is not None or status >= 400:
+            return True
+        return self.sample_rate >= 1.0 or random.random() < self.sample_rate
+
+    def log(self, *, method: str, route: str, upstream: Optional[str], status: int,
+            bytes_in: int, bytes_out: int, timings: Dict[str, float], error: Optional[str] = None):
+        if not self.should_log(status, error):
+            return
+        access = {
+            "method": method,
+            "route": route,
+            "upstream": upstream,
+            "status": status,
+            "bytes_in": bytes_in,
+            "bytes_out": bytes_out,
+            "timings_ms": {k: round(v * 1000, 3) for k, v in timings.items()},
+        }
+        if error is not None:
+            access["error"] = error
+        level = logging.ERROR if status >= 500 else logging.WARNING if status >= 400 else logging.INFO
+        self.logger.log(level, "access", extra={"access": access})
+
+
+class RequestTimer:
+    """요청 처리 단계별 소요 시간 측정"""
+
+    def __init__(self):
+        self.start = time.perf_counter()
+        self._last = self.start
+        self.timings: Dict[str, float] = {}
+
+    def mark(self, phase: str):
+        now = time.perf_counter()
+        self.timings[phase] = now - self._last
+        self._last = now
+
+    def finish(self) -> Dict[str, float]:
+        self.timings["total"] = time.perf_counter() - self.start
+        return self.timings
+
+
+def setup_logging(level: int = logging.INFO) -> BatchingQueueListener:
+    """루트 로거를 큐 기반 핸들러로 교체하고 배치 기록 스레드 시작"""
+    queue_size = int(os.getenv("LOG_QUEUE_SIZE", "10000"))
+    # 경고/오류 레코드용 여유분 (일반 레코드는 queue_size까지만 받음)
+    log_queue: queue.Queue = queue.Queue(maxsize=queue_size + max(queue_size // 10, 100))
+    formatter = StructuredFormatter("%(levelname)s:%(name)s:%(message)s")
+    listener = BatchingQueueListener(
+        log_queue,
+        formatter=formatter,
+        batch_size=int(os.getenv("LOG_BATCH_SIZE", "256")),
+        flush_interval=float(os.getenv("LOG_FLUSH_INTERVAL", "0.5")),
+    )
+
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.addHandler(DroppingQueueHandler(log_queue, soft_limit=queue_size))
+    root.setLevel(level)
+
+    # 업스트림 요청마다 남는 httpx INFO 로그는 액세스 로그와 중복이므로 끔
+    for name in ("httpx", "httpcore"):
+        logging.getLogger(name).setLevel(logging.WARNING)
+
+    # uvicorn 로거도 큐를 거치도록 전용 핸들러 제거; 요청별 액세스 로그는 AccessLogger가 대신 기록
+    for name in ("uvicorn", "uvicorn.error", "uvicorn.access"):
+        uvicorn_logger = logging.getLogger(name)
+        for handler in list(uvicorn_logger.handlers):
+            uvicorn_logger.removeHandler(handler)
+        uvicorn_logger.propagate = True
+    logging.getLogger("uvicorn.access").setLevel(logging.WARNING)
+
+    listener.start()
+    atexit.register(listener.stop)
+    return listener
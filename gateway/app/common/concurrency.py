@@ -0,0 +1,185 @@
+import asyncio
+import heapq
+import itertools
+import math
+import time
+from typing import Dict, List, Optional, Tuple
+
+PRIORITY_HIGH = 0
+PRIORITY_NORMAL = 1
+PRIORITY_LOW = 2
+
+PRIORITY_NAMES = {
+    "high": PRIORITY_HIGH,
+    "normal": PRIORITY_NORMAL,
+    "low": PRIORITY_LOW,
+}
+
+
+class Overloaded(Exception):
+    """동시성 한도와 대기열이 모두 찬 경우"""
+
+    def __init__(self, service: str, retry_after: int):
+        super().__init__(f"{service} 과부하")
+        self.service = service
+        self.retry_after = retry_after
+
+
+class AdaptiveLimiter:
+    """관측 지연 기반 AIMD 동시성 제한 + 우선순위 대기열
+
+    단기/장기 지연 EWMA의 비율이 latency_tolerance를 넘거나 오류가 나면 한도를 줄이고,
+    한도를 다 쓰는 동안 정상이면 조금씩 늘립니다.
+    """
+
+    def __init__(self, name: str, initial_limit: int = 20, min_limit: int = 1, max_limit: int = 200,
+                 max_queue: int = 100, queue_timeout: float = 1.0,
+                 latency_tolerance: float = 2.0, backoff: float = 0.9):
+        self.name = name
+        self.limit = float(initial_limit)
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.latency_tolerance = latency_tolerance
+        self.backoff = backoff
+
+        self.inflight = 0
+        self.baseline_latency: Optional[float] = None
+        self.avg_latency: Optional[float] = None
+        self._last_decrease = float("-inf")
+        self.accepted = 0
+        self.rejected = 0
+        self._waiters: List[Tuple[int, int, asyncio.Future]] = []
+        self._seq = itertools.count()
+
+    @property
+    def queued(self) -> int:
+        return sum(1 for _, _, fut in self._waiters if not fut.done())
+
+    def retry_after(self) -> int:
+        """대기열이 비워질 때까지의 대략적인 시간(초)"""
+        latency = self.avg_latency or 1.0
+        return max(1, math.ceil(latency * (self.queued + 1) / max(self.limit, 1.0)))
+
+    async def acquire(self, priority: int = PRIORITY_NORMAL):
+        if self.inflight < int(self.limit) and not self.queued:
+            self.inflight += 1
+            self.accepted += 1
+            return
+
+        if self.queued >= self.max_queue and not self._evict_lower(priority):
+            self.rejected += 1
+            raise Overloaded(self.name, self.retry_after())
+
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (priority, next(self._seq), future))
+        try:
+            await asyncio.wait_for(future, timeout=self.queue_timeout)
+        except asyncio.TimeoutError:
+            self.rejected += 1
+            raise Overloaded(self.name, self.retry_after())
+        except Overloaded:
+            # 더 높은 우선순위 요청에 자리를 내줌
+            self.rejected += 1
+            raise
+        except asyncio.CancelledError:
+            # 슬롯을 넘겨받은 직후 취소되었다면 반납
+            if future.done() and not future.cancelled():
+                self._release_slot()
+            raise
+        self.accepted += 1
+
+    def _evict_lower(self, priority: int) -> bool:
+        """대기열이 찼을 때 더 낮은 우선순위의 가장 늦은 대기 요청을 밀어냄"""
+        pending = [entry for entry in self._waiters if not entry[2].done()]
+        if not pending:
+            return False
+        worst = max(pending, key=lambda entry: (entry[0], entry[1]))
+        if worst[0] <= priority:
+            return False
+        worst[2].set_exception(Overloaded(self.name, self.retry_after()))
+        return True
+
+    def release(self, latency: float, ok: bool):
+        self._update_limit(latency, ok)
+        self._release_slot()
+
+    def _release_slot(self):
+        # 대기 중인 요청이 있으면 슬롯을 그대로 넘김
+        while self._waiters and self.inflight <= int(self.limit):
+            _, _, future = heapq.heappop(self._waiters)
+            if not future.done():
+                future.set_result(None)
+                return
+        self.inflight -= 1
+
+    def _update_limit(self, latency: float, ok: bool):
+        # 단기 EWMA(최근 지연)와 장기 EWMA(평상시 지연)의 비율로 혼잡 판단
+        saturated = self.inflight >= int(self.limit)
+        self.avg_latency = latency if self.avg_latency is None else self.avg_latency * 0.8 + latency * 0.2
+        if self.baseline_latency is None:
+            self.baseline_latency = latency
+        else:
+            # 한도를 다 쓰는 동안의 지연에는 스스로 만든 대기 시간이 섞이므로 기준에 천천히 반영
+            weight = 0.001 if saturated else 0.01
+            self.baseline_latency = self.baseline_latency * (1 - weight) + latency * weight
+        ratio = self.avg_latency / self.baseline_latency if self.baseline_latency > 0 else 1.0
+
+        if not ok or ratio > self.latency_tolerance:
+            # 감소는 한 윈도우(최근 지연 1회분)에 한 번만 적용
+            now = time.monotonic()
+            if now - self._last_decrease >= self.avg_latency:
+                self._last_decrease = now
+                self.limit = max(float(self.min_limit), self.limit * self.backoff)
+        elif saturated and ratio < (1 + self.latency_tolerance) / 2:
+            # 한도를 다 쓰면서 지연이 기준 근처일 때만 증가 (한도당 +1)
+            self.limit = min(float(self.max_limit), self.limit + 1.0 / self.limit)
+
+    def snapshot(self) -> Dict:
+        return {
+            "limit": round(self.limit, 2),
+            "inflight": self.inflight,
+            "queued": self.queued,
+            "accepted": self.accepted,
+            "rejected": self.rejected,
+            "avg_latency_ms": round(self.avg_latency * 1000, 3) if self.avg_latency is not None else None,
+            "baseline_latency_ms": round(self.baseline_latency * 1000, 3) if self.baseline_latency is not None else None,
+        }
+
+
+class LimiterRegistry:
+    """업스트림 서비스별 AdaptiveLimiter 관리"""
+
+    def __init__(self, **limiter_options):
+        self.limiter_options = limiter_options
+        self.limiters: Dict[str, AdaptiveLimiter] = {}
+
+    def get(self, service_name: str) -> AdaptiveLimiter:
+        limiter = self.limiters.get(service_name)
+        if limiter is None:
+            limiter = AdaptiveLimiter(service_name, **self.limiter_options)
+            self.limiters[service_name] = limiter
+        return limiter
+
+    def snapshot(self) -> Dict[str, Dict]:
+        return {name: limiter.snapshot() for name, limiter in self.limiters.items()}
+
+
+class Slot:
+    """limiter 슬롯 점유 구간; 결과에 따라 한도 조정"""
+
+    def __init__(self, limiter: AdaptiveLimiter, priority: int):
+        self.limiter = limiter
+        self.priority = priority
+        self.ok = True
+        self._started = 0.0
+
+    async def __aenter__(self):
+        await self.limiter.acquire(self.priority)
+        self._started = time.perf_counter()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        self.limiter.release(time.perf_counter() - self._started, self.ok and exc_type is None)
+        return False
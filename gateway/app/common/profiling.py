@@ -0,0 +1,193 @@
+import asyncio
+import cProfile
+import hmac
+import io
+import json
+import logging
+import os
+import pstats
+import time
+import uuid
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class ProfileStore:
+    """최근 요청 프로파일 결과 보관 (개수 제한)
+
+    directory를 지정하면 프로파일을 파일로 저장해 같은 디렉터리를 쓰는
+    다른 워커 프로세스에서도 조회할 수 있습니다.
+    """
+
+    def __init__(self, max_entries: int = 50, directory: Optional[str] = None):
+        self.max_entries = max_entries
+        self.directory = directory
+        self._entries: "OrderedDict[str, Dict]" = OrderedDict()
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    def add(self, entry: Dict) -> str:
+        profile_id = uuid.uuid4().hex[:12]
+        entry = {"id": profile_id, **entry}
+        if self.directory:
+            self._write(profile_id, entry)
+            return profile_id
+        self._entries[profile_id] = entry
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return profile_id
+
+    def get(self, profile_id: str) -> Optional[Dict]:
+        if not self.directory:
+            return self._entries.get(profile_id)
+        if not profile_id.isalnum():
+            return None
+        try:
+            with open(os.path.join(self.directory, f"{profile_id}.json"), encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def list(self):
+        if self.directory:
+            entries = [self.get(name[:-5]) for name in self._files()]
+            entries = [entry for entry in entries if entry is not None]
+            entries.sort(key=lambda entry: entry["created_at"], reverse=True)
+        else:
+            entries = list(reversed(self._entries.values()))
+        return [{k: v for k, v in entry.items() if k != "stats"} for entry in entries]
+
+    def _files(self) -> List[str]:
+        try:
+            return [name for name in os.listdir(self.directory) if name.endswith(".json")]
+        except OSError:
+            return []
+
+    def _write(self, profile_id: str, entry: Dict):
+        # 임시 파일에 쓴 뒤 rename해서 다른 워커가 쓰다 만 파일을 읽지 않도록 함
+        path = os.path.join(self.directory, f"{profile_id}.json")
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(entry, f)
+        os.replace(tmp_path, path)
+
+        # 오래된 파일부터 정리 (여러 워커가 동시에 지워도 무시)
+        files = self._files()
+        if len(files) > self.max_entries:
+            paths = [os.path.join(self.directory, name) for name in files]
+            paths.sort(key=lambda p: os.path.getmtime(p) if os.path.exists(p) else 0.0)
+            for old_path in paths[:len(paths) - self.max_entries]:
+                try:
+                    os.remove(old_path)
+                except OSError:
+                    pass
+
+
+class RequestProfiler:
+    """관리자 요청에 한해 요청 처리 구간을 cProfile로 측정
+
+    cProfile은 await 동안에도 켜져 있으므로 결과에는 같은 시간대에 이벤트
+    루프에서 실행된 다른 요청의 처리도 섞여 있습니다 (scope: event_loop).
+    """
+
+    def __init__(self, store: ProfileStore, admin_token: Optional[str], top_n: int = 40):
+        self.store = store
+        self.admin_token = admin_token
+        self.top_n = top_n
+        self._active = False
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.admin_token)
+
+    def is_authorized(self, token: Optional[str]) -> bool:
+        if not self.enabled or token is None:
+            return False
+        return hmac.compare_digest(token.encode(), self.admin_token.encode())
+
+    @contextmanager
+    def profile(self, method: str, path: str):
+        """프로파일링 구간; 다른 요청이 측정 중이면 결과 없이 통과"""
+        result: Dict = {"id": None}
+        if self._active:
+            yield result
+            return
+
+        self._active = True
+        profiler = cProfile.Profile()
+        started = time.perf_counter()
+        profiler.enable()
+        try:
+            yield result
+        finally:
+            profiler.disable()
+            self._active = False
+            elapsed = time.perf_counter() - started
+            buffer = io.StringIO()
+            stats = pstats.Stats(profiler, stream=buffer)
+            stats.sort_stats("cumulative").print_stats(self.top_n)
+            result["id"] = self.store.add({
+                "method": method,
+                "path": path,
+                "scope": "event_loop",
+                "elapsed_ms": round(elapsed * 1000, 3),
+                "created_at": time.time(),
+                "stats": buffer.getvalue(),
+            })
+
+
+class LoopLagMonitor:
+    """이벤트 루프 스케줄링 지연 측정 및 임계값 초과 시 경고 로그"""
+
+    def __init__(self, interval: float = 0.5, threshold: float = 0.1):
+        self.interval = interval
+        self.threshold = threshold
+        self.last_lag = 0.0
+        self.max_lag = 0.0
+        self.avg_lag = 0.0
+        self.samples = 0
+        self.slow_count = 0
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            expected = loop.time() + self.interval
+            await asyncio.sleep(self.interval)
+            self.record(max(0.0, loop.time() - expected))
+
+    def record(self, lag: float):
+        self.last_lag = lag
+        self.max_lag = max(self.max_lag, lag)
+        self.samples += 1
+        # 지수 이동 평균
+        self.avg_lag = lag if self.samples == 1 else self.avg_lag * 0.9 + lag * 0.1
+        if lag >= self.threshold:
+            self.slow_count += 1
+            logger.warning(f"이벤트 루프 지연 감지: {lag * 1000:.1f}ms (임계값 {self.threshold * 1000:.0f}ms)")
+
+    def snapshot(self) -> Dict:
+        return {
+            "last_lag_ms": round(self.last_lag * 1000, 3),
+            "avg_lag_ms": round(self.avg_lag * 1000, 3),
+            "max_lag_ms": round(self.max_lag * 1000, 3),
+            "samples": self.samples,
+            "slow_count": self.slow_count,
+            "threshold_ms": round(self.threshold * 1000, 3),
+        }
@@ -0,0 +1,135 @@
+import asyncio
+import logging
+import time
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+
+def parse_warmup_requests(value: str) -> List[Tuple[str, str]]:
+    """"GET /api/products, /api/users/1" 형식의 워밍업 요청 목록 파싱"""
+    requests = []
+    for item in value.split(","):
+        parts = item.strip().split()
+        if not parts:
+            continue
+        if len(parts) == 1:
+            requests.append(("GET", parts[0]))
+        else:
+            requests.append((parts[0].upper(), parts[1]))
+    return requests
+
+
+class Warmup:
+    """시작 시 업스트림 연결 예열, 헬스 체크, 워밍업 요청 재생 후 준비 완료 표시
+
+    전체 과정은 timeout 안에 끝나며, require_healthy면 정상 업스트림이 하나 이상
+    확인되어야 준비 완료가 됩니다 (이후 주기 헬스 체크 결과로 다시 판단).
+    """
+
+    def __init__(self, timeout: float = 30.0, connections: int = 4,
+                 requests: Optional[List[Tuple[str, str]]] = None, require_healthy: bool = True):
+        self.timeout = timeout
+        self.connections = connections
+        self.requests = requests or []
+        self.require_healthy = require_healthy
+        self.phase = "pending"
+        self.ready = False
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.health: Dict[str, bool] = {}
+        self.errors: List[str] = []
+
+    async def run(self, discovery, client: httpx.AsyncClient):
+        self.started_at = time.time()
+        try:
+            await asyncio.wait_for(self._run(discovery, client), timeout=self.timeout)
+        except asyncio.TimeoutError:
+            unhealthy = [name for name, ok in self.health.items() if not ok]
+            logger.warning(f"워밍업 시간 초과 ({self.timeout}s, 단계: {self.phase}), 비정상 서비스: {unhealthy}")
+            self.errors.append(f"timed out after {self.timeout}s in {self.phase}, unhealthy: {unhealthy}")
+        except Exception as e:
+            logger.error(f"워밍업 실패 (단계: {self.phase}): {e}")
+            self.errors.append(str(e))
+        self.phase = "done"
+        self.finished_at = time.time()
+        self.update_health(self.health)
+        if self.ready:
+            logger.info(f"워밍업 완료 ({self.finished_at - self.started_at:.2f}s)")
+        else:
+            logger.warning(f"워밍업 종료, 정상 업스트림이 없어 준비 대기 ({self.finished_at - self.started_at:.2f}s)")
+
+    def update_health(self, health: Dict[str, bool]):
+        """헬스 체크 결과 반영 (워밍업이 끝난 뒤 아직 준비 전이면 준비 완료 여부를 다시 판단)"""
+        self.health = health
+        if self.phase == "done" and not self.ready:
+            self.ready = not self.require_healthy or any(health.values())
+
+    async def _run(self, discovery, client: httpx.AsyncClient):
+        services = discovery.registry.get_all_services()
+
+        # 1. DNS 조회
+        self.phase = "resolve"
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(*[self._resolve(loop, service.url) for service in services.values()])
+
+        # 2. 업스트림별 커넥션 미리 열기 (헬스 체크 경로로 동시 요청 → 풀에 keep-alive로 남음)
+        self.phase = "connect"
+        await asyncio.gather(*[
+            self._touch(client, "GET", f"{service.url}{service.health_check}", timeout=5.0)
+            for service in services.values()
+            for _ in range(self.connections)
+        ])
+
+        # 3. 전체 헬스 체크 (필요하면 모두 정상이 될 때까지 반복, run의 timeout으로 중단)
+        self.phase = "health"
+        await self._wait_healthy(discovery)
+
+        # 4. 워밍업 요청 재생 (정상 업스트림의 첫 요청 경로를 미리 실행)
+        self.phase = "replay"
+        replays = []
+        for method, path in self.requests:
+            service_name = discovery.get_service_name_by_path(path)
+            if service_name is None or not self.health.get(service_name):
+                self.errors.append(f"skip {method} {path}: no healthy service")
+                continue
+            service = discovery.registry.get_service(service_name)
+            replays.append(self._touch(client, method, f"{service.url}{path}"))
+        await asyncio.gather(*replays)
+
+    async def _wait_healthy(self, discovery):
+        while True:
+            self.health = await discovery.health_check_all()
+            if not self.require_healthy or all(self.health.values()):
+                return
+            unhealthy = [name for name, ok in self.health.items() if not ok]
+            logger.info(f"워밍업 대기 중, 비정상 서비스: {unhealthy}")
+            await asyncio.sleep(1.0)
+
+    async def _resolve(self, loop, url: str):
+        parts = urlsplit(url)
+        try:
+            await loop.getaddrinfo(parts.hostname, parts.port or (443 if parts.scheme == "https" else 80))
+        except OSError as e:
+            self.errors.append(f"resolve {parts.hostname}: {e}")
+
+    async def _touch(self, client: httpx.AsyncClient, method: str, url: str, timeout: Optional[float] = None):
+        try:
+            if timeout is None:
+                await client.request(method, url)
+            else:
+                await client.request(method, url, timeout=timeout)
+        except httpx.HTTPError as e:
+            self.errors.append(f"{method} {url}: {e}")
+
+    def snapshot(self) -> Dict:
+        return {
+            "ready": self.ready,
+            "phase": self.phase,
+            "health": self.health,
+            "errors": self.errors[-20:],
+            "duration": round((self.finished_at or time.time()) - self.started_at, 3) if self.started_at else None,
+        }
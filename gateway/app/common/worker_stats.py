@@ -0,0 +1,168 @@
+import json
+import logging
+import multiprocessing
+import os
+import time
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+SLOT_SIZE = 16384
+# 워커가 재시작돼도 이어서 누적되는 카운터
+CARRIED_COUNTERS = ("requests", "errors", "shed")
+
+
+class WorkerStats:
+    """워커별 메트릭 스냅샷을 공유 메모리 슬롯에 기록하고 전체를 집계
+
+    각 워커는 자신의 슬롯에만 JSON 스냅샷을 쓰고, 읽는 쪽은 버전 카운터(seqlock)로
+    쓰는 도중의 데이터를 건너뜁니다. 재시작된 워커는 카운터가 0부터 다시 시작하므로
+    마스터가 이전 워커의 마지막 값을 carried에 보관해 두고 읽을 때 더합니다.
+    """
+
+    def __init__(self, slots: int = 1, buffer=None, versions=None, restarts=None, carried=None, index: int = 0):
+        self.slots = slots
+        self.buffer = buffer if buffer is not None else multiprocessing.RawArray("c", slots * SLOT_SIZE)
+        self.versions = versions if versions is not None else multiprocessing.RawArray("q", slots)
+        self.restarts = restarts if restarts is not None else multiprocessing.RawArray("q", slots)
+        self.carried = carried if carried is not None else multiprocessing.RawArray("q", slots * len(CARRIED_COUNTERS))
+        self.index = index
+        self.started_at = time.time()
+        self.requests = 0
+        self.errors = 0
+        self.shed = 0
+        self.inflight = 0
+        self._oversize_logged = False
+
+    @classmethod
+    def create_shared(cls, ctx, slots: int) -> "WorkerStats":
+        """마스터 프로세스에서 워커 수만큼 공유 슬롯 생성"""
+        return cls(
+            slots=slots,
+            buffer=ctx.RawArray("c", slots * SLOT_SIZE),
+            versions=ctx.RawArray("q", slots),
+            restarts=ctx.RawArray("q", slots),
+            carried=ctx.RawArray("q", slots * len(CARRIED_COUNTERS)),
+        )
+
+    def shared_arrays(self):
+        return self.buffer, self.versions, self.restarts, self.carried
+
+    def bind(self, slots: int, buffer, versions, restarts, carried, index: int):
+        """워커 프로세스에서 마스터가 만든 공유 슬롯에 연결"""
+        self.slots = slots
+        self.buffer = buffer
+        self.versions = versions
+        self.restarts = restarts
+        self.carried = carried
+        self.index = index
+
+    def carry_over(self, index: int):
+        """종료된 워커의 마지막 누적 카운터를 보관하고 슬롯을 비움 (마스터에서 재시작 전에 호출)
+
+        마지막 publish 이후의 요청은 스냅샷에 없으므로 최대 STATS_PUBLISH_INTERVAL 만큼은 누락될 수 있습니다.
+        """
+        snapshot = self.read_slot(index)
+        if snapshot is not None:
+            # read_slot 값에 이미 이전 보관분이 포함되어 있음
+            for offset, key in enumerate(CARRIED_COUNTERS):
+                self.carried[index * len(CARRIED_COUNTERS) + offset] = snapshot[key]
+        # 새 워커가 첫 스냅샷을 쓰기 전까지 이전 워커 값이 이중으로 집계되지 않도록 비움
+        self.versions[index] = 0
+
+    def record_request(self, status_code: int):
+        self.requests += 1
+        if status_code >= 500:
+            self.errors += 1
+
+    def record_shed(self):
+        self.shed += 1
+
+    def publish(self, extra: Dict):
+        snapshot = {
+            "index": self.index,
+            "pid": os.getpid(),
+            "started_at": self.started_at,
+            "heartbeat": time.time(),
+            "requests": self.requests,
+            "errors": self.errors,
+            "shed": self.shed,
+            "inflight": self.inflight,
+            **extra,
+        }
+        data = json.dumps(snapshot, separators=(",", ":")).encode()
+        if len(data) > SLOT_SIZE:
+            if not self._oversize_logged:
+                logger.warning(f"워커 메트릭 스냅샷이 슬롯 크기를 초과합니다: {len(data)} bytes")
+                self._oversize_logged = True
+            return
+        start = self.index * SLOT_SIZE
+        # 홀수 버전 = 쓰는 중
+        self.versions[self.index] += 1
+        self.buffer[start:start + len(data)] = data
+        if len(data) < SLOT_SIZE:
+            self.buffer[start + len(data)] = b"\0"
+        self.versions[self.index] += 1
+
+    def read_slot(self, index: int, retries: int = 3) -> Optional[Dict]:
+        start = index * SLOT_SIZE
+        for _ in range(retries):
+            version = self.versions[index]
+            if version == 0:
+                return None
+            if version % 2:
+                continue
+            raw = self.buffer[start:start + SLOT_SIZE].split(b"\0", 1)[0]
+            if self.versions[index] != version:
+                continue
+            try:
+                snapshot = json.loads(raw)
+            except ValueError:
+                return None
+            snapshot["restarts"] = self.restarts[index]
+            for offset, key in enumerate(CARRIED_COUNTERS):
+                snapshot[key] += self.carried[index * len(CARRIED_COUNTERS) + offset]
+            return snapshot
+        return None
+
+    def read_all(self) -> List[Dict]:
+        return [s for s in (self.read_slot(i) for i in range(self.slots)) if s is not None]
+
+
+def is_alive(snapshot: Dict, stale_after: float) -> bool:
+    return time.time() - snapshot["heartbeat"] <= stale_after
+
+
+def aggregate(snapshots: List[Dict], stale_after: float) -> Dict:
+    """워커 스냅샷을 합산 (살아있는 워커 기준, 누적 카운터는 전체 합)"""
+    alive = [s for s in snapshots if is_alive(s, stale_after)]
+    event_loop: Dict = {"last_lag_ms": 0.0, "avg_lag_ms": 0.0, "max_lag_ms": 0.0, "slow_count": 0}
+    limiters: Dict[str, Dict] = {}
+
+    for s in alive:
+        loop = s.get("event_loop", {})
+        event_loop["last_lag_ms"] = max(event_loop["last_lag_ms"], loop.get("last_lag_ms", 0.0))
+        event_loop["max_lag_ms"] = max(event_loop["max_lag_ms"], loop.get("max_lag_ms", 0.0))
+        event_loop["avg_lag_ms"] += loop.get("avg_lag_ms", 0.0) / len(alive)
+        event_loop["slow_count"] += loop.get("slow_count", 0)
+
+        for name, lim in s.get("limiters", {}).items():
+            total = limiters.setdefault(name, {
+                "limit": 0.0, "inflight": 0, "queued": 0, "accepted": 0, "rejected": 0, "workers": 0
+            })
+            for key in ("limit", "inflight", "queued", "accepted", "rejected"):
+                total[key] += lim.get(key, 0)
+            total["workers"] += 1
+    event_loop["avg_lag_ms"] = round(event_loop["avg_lag_ms"], 3)
+
+    return {
+        "workers": len(snapshots),
+        "alive_workers": len(alive),
+        "restarts": sum(s.get("restarts", 0) for s in snapshots),
+        "requests": sum(s["requests"] for s in snapshots),
+        "errors": sum(s["errors"] for s in snapshots),
+        "shed": sum(s["shed"] for s in snapshots),
+        "inflight": sum(s["inflight"] for s in alive),
+        "event_loop": event_loop,
+        "limiters": limiters,
+    }
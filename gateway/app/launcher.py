@@ -0,0 +1,158 @@
+"""
+멀티 워커 게이트웨이 실행기
+
+공유 리스닝 소켓 하나를 N개의 워커 프로세스가 함께 사용하고,
+비정상 종료된 워커는 자동으로 다시 띄웁니다.
+
+    python launcher.py            # 워커 수 = CPU 수
+    GATEWAY_WORKERS=4 python launcher.py
+"""
+
+import logging
+import multiprocessing
+import os
+import shutil
+import signal
+import tempfile
+import time
+from typing import Dict, List, Optional
+
+import uvicorn
+
+from common.worker_stats import WorkerStats
+
+logger = logging.getLogger("launcher")
+
+
+def cpu_count() -> int:
+    # 컨테이너의 CPU 제한(cpuset)을 반영
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+def select_loop() -> str:
+    try:
+        import uvloop  # noqa: F401
+        return "uvloop"
+    except ImportError:
+        return "asyncio"
+
+
+def select_http() -> str:
+    try:
+        import httptools  # noqa: F401
+        return "httptools"
+    except ImportError:
+        return "h11"
+
+
+def run_worker(index: int, slots: int, sock, buffer, versions, restarts, carried, loop: str, http: str):
+    """워커 프로세스 진입점"""
+    import main
+
+    main.worker_stats.bind(slots, buffer, versions, restarts, carried, index)
+    # 로깅은 main의 큐 핸들러가 담당하므로 uvicorn 기본 로깅 설정과 액세스 로그는 끔
+    config = uvicorn.Config(main.app, loop=loop, http=http, lifespan="on", log_config=None, access_log=False,
+                            timeout_graceful_shutdown=int(os.getenv("GRACEFUL_SHUTDOWN_TIMEOUT", "30")))
+    uvicorn.Server(config).run(sockets=[sock])
+
+
+class Supervisor:
+    """워커 프로세스 생성, 감시, 재시작"""
+
+    def __init__(self, host: str, port: int, workers: int):
+        self.workers = workers
+        self.ctx = multiprocessing.get_context("spawn")
+        self.config = uvicorn.Config("main:app", host=host, port=port)
+        self.stats = WorkerStats.create_shared(self.ctx, workers)
+        self.loop = select_loop()
+        self.http = select_http()
+        self.processes: List[Optional[multiprocessing.Process]] = [None] * workers
+        self.started_at: Dict[int, float] = {}
+        self.restart_delay: Dict[int, float] = {}
+        self.restart_at: Dict[int, float] = {}
+        self.should_exit = False
+        self.sock = None
+        self.profile_dir: Optional[str] = None
+
+    def spawn(self, index: int):
+        process = self.ctx.Process(
+            target=run_worker,
+            args=(index, self.workers, self.sock, *self.stats.shared_arrays(), self.loop, self.http),
+            name=f"gateway-worker-{index}",
+        )
+        process.start()
+        self.processes[index] = process
+        self.started_at[index] = time.monotonic()
+        logger.info(f"워커 {index} 시작 (pid={process.pid})")
+
+    def run(self):
+        self.sock = self.config.bind_socket()
+        # 요청 프로파일을 어느 워커에서든 조회할 수 있도록 공유 디렉터리 사용
+        if not os.getenv("PROFILE_DIR"):
+            self.profile_dir = tempfile.mkdtemp(prefix="gateway-profiles-")
+            os.environ["PROFILE_DIR"] = self.profile_dir
+        logger.info(f"게이트웨이 워커 {self.workers}개 시작 (loop={self.loop}, http={self.http})")
+
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            signal.signal(sig, self._handle_exit)
+
+        for index in range(self.workers):
+            self.spawn(index)
+
+        while not self.should_exit:
+            self.check_workers()
+            time.sleep(0.5)
+
+        self.shutdown()
+
+    def check_workers(self):
+        # 재시작 대기 중에도 다른 워커 감시와 종료 신호 처리가 막히지 않도록 기한만 기록
+        now = time.monotonic()
+        for index, process in enumerate(self.processes):
+            if self.should_exit:
+                return
+            if process is not None and process.exitcode is not None:
+                self._schedule_restart(index, process.exitcode)
+            elif process is None and now >= self.restart_at.get(index, float("inf")):
+                del self.restart_at[index]
+                self.stats.restarts[index] += 1
+                self.spawn(index)
+
+    def _schedule_restart(self, index: int, exitcode: int):
+        # 시작 직후 반복해서 죽는 워커는 점점 늦게 재시작
+        uptime = time.monotonic() - self.started_at.get(index, 0.0)
+        delay = self.restart_delay.get(index, 0.0)
+        delay = min(max(delay * 2, 1.0), 30.0) if uptime < 10.0 else 0.0
+        self.restart_delay[index] = delay
+        logger.warning(f"워커 {index} 비정상 종료 (exitcode={exitcode}), {delay:.0f}초 후 재시작")
+        self.processes[index] = None
+        self.stats.carry_over(index)
+        self.restart_at[index] = time.monotonic() + delay
+
+    def _handle_exit(self, signum, frame):
+        self.should_exit = True
+
+    def shutdown(self):
+        logger.info("워커 종료 중...")
+        alive = [p for p in self.processes if p is not None and p.is_alive()]
+        for process in alive:
+            process.terminate()
+        deadline = time.monotonic() + int(os.getenv("GRACEFUL_SHUTDOWN_TIMEOUT", "30"))
+        for process in alive:
+            process.join(max(0.0, deadline - time.monotonic()))
+            if process.is_alive():
+                process.kill()
+        self.sock.close()
+        if self.profile_dir:
+            shutil.rmtree(self.profile_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    Supervisor(
+        host=os.getenv("GATEWAY_HOST", "0.0.0.0"),
+        port=int(os.getenv("PORT", os.getenv("GATEWAY_PORT", "8000"))),
+        workers=int(os.getenv("GATEWAY_WORKERS", "0")) or cpu_count(),
+    ).run()
@@ -1,6 +1,6 @@
 from fastapi import FastAPI, Request, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response, StreamingResponse
 import httpx
 import logging
 import os
@@ -9,10 +9,47 @@ from pydantic import BaseModel
 from datetime import datetime
 import asyncio
 
-# 로깅 설정
-logging.basicConfig(level=logging.INFO)
+from common.access_log import AccessLogger, RequestTimer, setup_logging
+from common.concurrency import PRIORITY_NAMES, PRIORITY_NORMAL, LimiterRegistry, Overloaded, Slot
+from common.profiling import LoopLagMonitor, ProfileStore, RequestProfiler
+from common.warmup import Warmup, parse_warmup_requests
+from common.worker_stats import WorkerStats, aggregate, is_alive
+
+# 로깅 설정 (큐 기반 비동기 배치 기록)
+log_listener = setup_logging(logging.INFO)
 logger = logging.getLogger(__name__)
 
+# 액세스 로그 (성공 요청 샘플링 비율, 오류는 항상 기록)
+access_logger = AccessLogger(sample_rate=float(os.getenv("ACCESS_LOG_SAMPLE_RATE", "1.0")))
+
+# 요청 프로파일링 (GATEWAY_ADMIN_TOKEN 설정 시에만 활성화)
+PROFILE_HEADER = "x-profile"
+PROFILE_QUERY_PARAM = "_profile"
+ADMIN_TOKEN_HEADER = "x-admin-token"
+PRIORITY_HEADER = "x-request-priority"
+# 게이트웨이에서만 쓰는 헤더 (업스트림으로 전달하지 않음)
+GATEWAY_ONLY_HEADERS = {"host", PROFILE_HEADER, ADMIN_TOKEN_HEADER, PRIORITY_HEADER}
+# PROFILE_DIR 지정 시 워커 간 공유 (launcher.py가 자동으로 설정)
+profile_store = ProfileStore(
+    max_entries=int(os.getenv("PROFILE_MAX_ENTRIES", "50")),
+    directory=os.getenv("PROFILE_DIR") or None
+)
+request_profiler = RequestProfiler(profile_store, admin_token=os.getenv("GATEWAY_ADMIN_TOKEN"))
+
+# 이벤트 루프 지연 모니터
+loop_monitor = LoopLagMonitor(
+    interval=float(os.getenv("LOOP_LAG_INTERVAL", "0.5")),
+    threshold=float(os.getenv("LOOP_LAG_THRESHOLD", "0.1"))
+)
+
+# 워커별 메트릭 (launcher.py로 실행 시 공유 메모리 슬롯에 연결됨)
+worker_stats = WorkerStats()
+STATS_PUBLISH_INTERVAL = float(os.getenv("STATS_PUBLISH_INTERVAL", "1.0"))
+STATS_STALE_AFTER = STATS_PUBLISH_INTERVAL * 3
+
+# 업스트림 헬스체크 주기 (프록시 요청은 마지막 결과만 참조)
+HEALTH_CHECK_INTERVAL = float(os.getenv("HEALTH_CHECK_INTERVAL", "5.0"))
+
 # FastAPI 앱 생성
 app = FastAPI(
     title="MSA Gateway",
@@ -68,8 +105,9 @@ class ServiceRegistry:
 
 # 서비스 디스커버리
 class ServiceDiscovery:
-    def __init__(self, registry: ServiceRegistry):
+    def __init__(self, registry: ServiceRegistry, client: httpx.AsyncClient):
         self.registry = registry
+        self.client = client
     
     async def health_check(self, service_name: str) -> bool:
         service = self.registry.get_service(service_name)
@@ -77,23 +115,30 @@ class ServiceDiscovery:
             return False
         
         try:
-            async with httpx.AsyncClient(timeout=5.0) as client:
-                response = await client.get(f"{service.url}{service.health_check}")
-                is_healthy = response.status_code == 200
-                self.registry.update_status(service_name, "healthy" if is_healthy else "unhealthy")
-                return is_healthy
+            response = await self.client.get(f"{service.url}{service.health_check}", timeout=5.0)
+            is_healthy = response.status_code == 200
+            self.registry.update_status(service_name, "healthy" if is_healthy else "unhealthy")
+            return is_healthy
         except Exception as e:
             logger.error(f"헬스체크 실패 {service_name}: {e}")
             self.registry.update_status(service_name, "unhealthy")
             return False
     
+    def is_available(self, service_name: str) -> bool:
+        # 아직 확인 전(unknown)인 서비스는 통과시키고, 최근 헬스체크에서 실패한 서비스만 차단
+        service = self.registry.get_service(service_name)
+        return service is not None and service.status != "unhealthy"
+    
     async def health_check_all(self) -> Dict[str, bool]:
-        results = {}
-        for service_name in self.registry.get_all_services().keys():
-            results[service_name] = await self.health_check(service_name)
-        return results
+        names = list(self.registry.get_all_services().keys())
+        results = await asyncio.gather(*[self.health_check(name) for name in names])
+        return dict(zip(names, results))
     
     def get_service_by_path(self, path: str) -> Optional[ServiceInfo]:
+        service_name = self.get_service_name_by_path(path)
+        return self.registry.get_service(service_name) if service_name else None
+    
+    def get_service_name_by_path(self, path: str) -> Optional[str]:
         # 경로 기반 서비스 매핑
         path_mapping = {
             "/users": "user-service",
@@ -106,57 +151,196 @@ class ServiceDiscovery:
         
         for route, service_name in path_mapping.items():
             if path.startswith(route):
-                return self.registry.get_service(service_name)
+                return service_name
         return None
 
+def request_priority(request: Request) -> int:
+    priority = PRIORITY_NAMES.get(request.headers.get(PRIORITY_HEADER, "").lower(), PRIORITY_NORMAL)
+    # high는 대기열을 앞지르고 다른 요청을 밀어낼 수 있으므로 관리자 토큰이 있을 때만 허용
+    if priority < PRIORITY_NORMAL and not request_profiler.is_authorized(request.headers.get(ADMIN_TOKEN_HEADER)):
+        return PRIORITY_NORMAL
+    return priority
+
+STREAMING_MEDIA_TYPES = ("text/event-stream", "application/x-ndjson")
+# 클라이언트가 Accept 헤더를 보내지 않아도 스트리밍으로 응답하는 경로
+STREAMING_PATH_SUFFIXES = ("/events", "/export")
+# 응답을 다시 만들 때 업스트림 값을 그대로 쓰면 안 되는 헤더
+HOP_BY_HOP_HEADERS = {"content-length", "transfer-encoding", "connection"}
+
+def is_streaming_request(request: Request, path: str) -> bool:
+    accept = request.headers.get("accept", "")
+    content_type = request.headers.get("content-type", "")
+    return (path.endswith(STREAMING_PATH_SUFFIXES)
+            or any(t in accept or content_type.startswith(t) for t in STREAMING_MEDIA_TYPES))
+
+def is_streaming_response(response: httpx.Response) -> bool:
+    return response.headers.get("content-type", "").startswith(STREAMING_MEDIA_TYPES)
+
 # 프록시 서비스
 class ProxyService:
-    def __init__(self, discovery: ServiceDiscovery):
+    def __init__(self, discovery: ServiceDiscovery, limiters: LimiterRegistry, client: httpx.AsyncClient):
         self.discovery = discovery
+        self.limiters = limiters
+        self.client = client
+        self.stream_client: Optional[httpx.AsyncClient] = None
     
-    async def forward_request(self, request: Request, path: str) -> JSONResponse:
-        # 서비스 찾기
-        service = self.discovery.get_service_by_path(path)
-        if not service:
-            raise HTTPException(status_code=404, detail="서비스를 찾을 수 없습니다")
-        
-        # 헬스체크
-        if not await self.discovery.health_check(service.url.split('/')[-1]):
-            raise HTTPException(status_code=503, detail="서비스가 사용 불가능합니다")
-        
-        # 요청 전달
+    async def forward_request(self, request: Request, path: str) -> Response:
+        timer = RequestTimer()
+        upstream = None
+        status_code = 500
+        bytes_in = 0
+        bytes_out = 0
+        error = None
+        worker_stats.inflight += 1
         try:
-            # 요청 바디 읽기
-            body = await request.body()
+            # 서비스 찾기
+            service_name = self.discovery.get_service_name_by_path(path)
+            service = self.discovery.registry.get_service(service_name) if service_name else None
+            if not service:
+                raise HTTPException(status_code=404, detail="서비스를 찾을 수 없습니다")
+            upstream = service.url
             
-            # 헤더 준비
-            headers = dict(request.headers)
-            headers.pop("host", None)  # 호스트 헤더 제거
+            # 헬스체크 (백그라운드 주기 점검 결과 참조, 요청마다 업스트림을 호출하지 않음)
+            if not self.discovery.is_available(service_name):
+                raise HTTPException(status_code=503, detail="서비스가 사용 불가능합니다")
             
-            # 프록시 요청
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                response = await client.request(
-                    method=request.method,
-                    url=f"{service.url}{path}",
-                    headers=headers,
-                    content=body,
-                    params=request.query_params
-                )
-                
-                return JSONResponse(
-                    content=response.json() if response.headers.get("content-type", "").startswith("application/json") else response.text,
-                    status_code=response.status_code,
-                    headers=dict(response.headers)
-                )
+            # 업스트림별 동시성 제한 (한도와 대기열 초과 시 즉시 거절)
+            async with Slot(self.limiters.get(service_name), request_priority(request)) as slot:
+                timer.mark("queue")
                 
-        except Exception as e:
-            logger.error(f"프록시 요청 실패: {e}")
-            raise HTTPException(status_code=500, detail="내부 서버 오류")
+                # 요청 전달
+                try:
+                    # 헤더 준비
+                    headers = {k: v for k, v in request.headers.items() if k.lower() not in GATEWAY_ONLY_HEADERS}
+                    params = [(k, v) for k, v in request.query_params.multi_items() if k != PROFILE_QUERY_PARAM]
+                    
+                    # 이벤트 스트림과 NDJSON은 버퍼링/읽기 타임아웃 없이 그대로 중계
+                    if is_streaming_request(request, path):
+                        content = request.stream() if request.method in ("POST", "PUT", "PATCH") else None
+                        result = await self._open_stream(request.method, f"{service.url}{path}", headers, content, params)
+                        timer.mark("upstream")
+                        status_code = result.status_code
+                        return result
+                    
+                    # 요청 바디 읽기
+                    body = await request.body()
+                    bytes_in = len(body)
+                    
+                    # 프록시 요청 (공유 커넥션 풀 사용)
+                    upstream_request = self.client.build_request(
+                        request.method, f"{service.url}{path}", headers=headers, content=body, params=params
+                    )
+                    response = await self.client.send(upstream_request, stream=True)
+                    slot.ok = response.status_code < 500
+                    status_code = response.status_code
+                    
+                    # 요청 헤더로는 알 수 없었던 스트리밍 응답은 버퍼링하지 않고 중계
+                    if is_streaming_response(response):
+                        timer.mark("upstream")
+                        return self._relay(response)
+                    
+                    try:
+                        response_body = await response.aread()
+                    finally:
+                        await response.aclose()
+                    timer.mark("upstream")
+                    bytes_out = len(response_body)
+                    
+                    # 본문은 디코딩된 상태이므로 content-encoding도 제외
+                    response_headers = {
+                        k: v for k, v in response.headers.items()
+                        if k.lower() not in HOP_BY_HOP_HEADERS and k.lower() != "content-encoding"
+                    }
+                    result = Response(content=response_body, status_code=response.status_code, headers=response_headers)
+                    timer.mark("encode")
+                    return result
+                    
+                except Exception as e:
+                    logger.error(f"프록시 요청 실패: {e}")
+                    error = str(e)
+                    raise HTTPException(status_code=500, detail="내부 서버 오류")
+        except Overloaded as e:
+            status_code = 503
+            worker_stats.record_shed()
+            raise HTTPException(
+                status_code=503,
+                detail="서비스가 과부하 상태입니다",
+                headers={"Retry-After": str(e.retry_after)}
+            )
+        except HTTPException as e:
+            status_code = e.status_code
+            raise
+        finally:
+            worker_stats.inflight -= 1
+            worker_stats.record_request(status_code)
+            access_logger.log(
+                method=request.method,
+                route=path,
+                upstream=upstream,
+                status=status_code,
+                bytes_in=bytes_in,
+                bytes_out=bytes_out,
+                timings=timer.finish(),
+                error=error
+            )
+
+    async def _open_stream(self, method: str, url: str, headers: Dict, content, params) -> StreamingResponse:
+        # 스트림은 연결 수립까지만 동시성 슬롯을 점유하고 이후에는 공유 클라이언트로 유지
+        if self.stream_client is None:
+            self.stream_client = httpx.AsyncClient(
+                timeout=httpx.Timeout(10.0, read=None),
+                limits=httpx.Limits(max_connections=None, max_keepalive_connections=20)
+            )
+        upstream_request = self.stream_client.build_request(method, url, headers=headers, content=content, params=params)
+        response = await self.stream_client.send(upstream_request, stream=True)
+        return self._relay(response)
+    
+    def _relay(self, response: httpx.Response) -> StreamingResponse:
+        async def relay():
+            try:
+                async for chunk in response.aiter_raw():
+                    yield chunk
+            finally:
+                await response.aclose()
+        
+        response_headers = {k: v for k, v in response.headers.items() if k.lower() not in HOP_BY_HOP_HEADERS}
+        response_headers["X-Accel-Buffering"] = "no"
+        return StreamingResponse(relay(), status_code=response.status_code, headers=response_headers)
+    
+    async def close(self):
+        await self.client.aclose()
+        if self.stream_client is not None:
+            await self.stream_client.aclose()
+            self.stream_client = None
 
 # 전역 인스턴스 생성
 service_registry = ServiceRegistry()
-service_discovery = ServiceDiscovery(service_registry)
-proxy_service = ProxyService(service_discovery)
+# 업스트림 공유 HTTP 클라이언트 (커넥션 풀 재사용, 워밍업 시 미리 연결)
+upstream_client = httpx.AsyncClient(
+    timeout=30.0,
+    limits=httpx.Limits(
+        max_connections=int(os.getenv("UPSTREAM_MAX_CONNECTIONS", "100")),
+        max_keepalive_connections=int(os.getenv("UPSTREAM_MAX_KEEPALIVE", "20"))
+    )
+)
+service_discovery = ServiceDiscovery(service_registry, upstream_client)
+limiter_registry = LimiterRegistry(
+    initial_limit=int(os.getenv("LIMITER_INITIAL_LIMIT", "20")),
+    min_limit=int(os.getenv("LIMITER_MIN_LIMIT", "1")),
+    max_limit=int(os.getenv("LIMITER_MAX_LIMIT", "200")),
+    max_queue=int(os.getenv("LIMITER_MAX_QUEUE", "100")),
+    queue_timeout=float(os.getenv("LIMITER_QUEUE_TIMEOUT", "1.0")),
+    latency_tolerance=float(os.getenv("LIMITER_LATENCY_TOLERANCE", "2.0"))
+)
+proxy_service = ProxyService(service_discovery, limiter_registry, upstream_client)
+
+# 시작 시 워밍업 (완료 전까지 /ready는 503)
+warmup = Warmup(
+    timeout=float(os.getenv("WARMUP_TIMEOUT", "30")),
+    connections=int(os.getenv("WARMUP_CONNECTIONS", "4")),
+    requests=parse_warmup_requests(os.getenv("WARMUP_REQUESTS", "")),
+    require_healthy=os.getenv("WARMUP_REQUIRE_HEALTHY", "1") == "1"
+)
 
 # 기본 서비스 등록
 def register_default_services():
@@ -178,30 +362,98 @@ def register_default_services():
     for name, config in services.items():
         service_registry.register(name, config["url"], config["health_check"])
 
+# 워커 메트릭 스냅샷 기록
+def publish_worker_stats():
+    worker_stats.publish({
+        "event_loop": loop_monitor.snapshot(),
+        "limiters": limiter_registry.snapshot(),
+        "ready": warmup.ready
+    })
+
+async def health_check_periodically():
+    while True:
+        await asyncio.sleep(HEALTH_CHECK_INTERVAL)
+        warmup.update_health(await service_discovery.health_check_all())
+
+async def publish_worker_stats_periodically():
+    while True:
+        publish_worker_stats()
+        await asyncio.sleep(STATS_PUBLISH_INTERVAL)
+
+def aggregated_stats() -> Dict:
+    # 현재 워커의 값은 최신으로 갱신 후 전체 집계
+    publish_worker_stats()
+    return aggregate(worker_stats.read_all(), STATS_STALE_AFTER)
+
+stats_task: Optional[asyncio.Task] = None
+warmup_task: Optional[asyncio.Task] = None
+health_task: Optional[asyncio.Task] = None
+
 # 앱 시작/종료 이벤트
 @app.on_event("startup")
 async def startup_event():
+    global stats_task, warmup_task, health_task
     logger.info("MSA Gateway 시작 중...")
     register_default_services()
     logger.info("기본 서비스 등록 완료")
+    if os.getenv("LOOP_DEBUG") == "1":
+        # asyncio 디버그 모드: 임계값보다 오래 걸린 콜백을 asyncio 로거로 기록
+        loop = asyncio.get_running_loop()
+        loop.set_debug(True)
+        loop.slow_callback_duration = loop_monitor.threshold
+    loop_monitor.start()
+    stats_task = asyncio.create_task(publish_worker_stats_periodically())
+    warmup_task = asyncio.create_task(warmup.run(service_discovery, upstream_client))
+    health_task = asyncio.create_task(health_check_periodically())
 
 @app.on_event("shutdown")
 async def shutdown_event():
     logger.info("MSA Gateway 종료 중...")
+    await loop_monitor.stop()
+    if stats_task is not None:
+        stats_task.cancel()
+    if warmup_task is not None:
+        warmup_task.cancel()
+    if health_task is not None:
+        health_task.cancel()
+    await proxy_service.close()
 
 # 헬스체크 엔드포인트
 @app.get("/health")
 async def health_check():
+    stats = aggregated_stats()
     return {
         "status": "healthy",
         "timestamp": datetime.now().isoformat(),
-        "service": "msa-gateway"
+        "service": "msa-gateway",
+        "worker": {"index": worker_stats.index, "pid": os.getpid()},
+        "workers": {"total": worker_stats.slots, "alive": stats["alive_workers"], "restarts": stats["restarts"]},
+        "requests": stats["requests"],
+        "inflight": stats["inflight"]
     }
 
+# 준비 상태 확인 (워밍업 완료 전에는 503, 로드 밸런서용)
+@app.get("/ready")
+async def readiness_check():
+    publish_worker_stats()
+    workers = [s for s in worker_stats.read_all() if is_alive(s, STATS_STALE_AFTER)]
+    ready = warmup.ready and all(s.get("ready", True) for s in workers)
+    return JSONResponse(
+        status_code=200 if ready else 503,
+        content={
+            "status": "ready" if ready else "not_ready",
+            "timestamp": datetime.now().isoformat(),
+            "warmup": warmup.snapshot(),
+            "workers_ready": sum(1 for s in workers if s.get("ready", True)),
+            "workers_alive": len(workers)
+        }
+    )
+
 # 서비스 상태 확인
 @app.get("/services/status")
 async def get_services_status():
     services = service_registry.get_all_services()
+    limiters = aggregated_stats()["limiters"]
     status = {}
     
     for name, service in services.items():
@@ -210,7 +462,8 @@ async def get_services_status():
             "url": service.url,
             "status": service.status,
             "healthy": is_healthy,
-            "last_check": service.last_check.isoformat() if service.last_check else None
+            "last_check": service.last_check.isoformat() if service.last_check else None,
+            "limiter": limiters.get(name)
         }
     
     return status
@@ -236,10 +489,61 @@ async def health_check_all():
         "results": results
     }
 
+# 게이트웨이 메트릭
+@app.get("/metrics")
+async def get_metrics():
+    stats = aggregated_stats()
+    return {
+        "timestamp": datetime.now().isoformat(),
+        **stats,
+        "per_worker": [
+            {
+                "index": s["index"],
+                "pid": s["pid"],
+                "alive": is_alive(s, STATS_STALE_AFTER),
+                "restarts": s["restarts"],
+                "requests": s["requests"],
+                "errors": s["errors"],
+                "inflight": s["inflight"],
+                "loop_lag_ms": s.get("event_loop", {}).get("last_lag_ms")
+            }
+            for s in worker_stats.read_all()
+        ]
+    }
+
+def require_admin(request: Request):
+    if not request_profiler.is_authorized(request.headers.get(ADMIN_TOKEN_HEADER)):
+        raise HTTPException(status_code=403, detail="관리자 권한이 필요합니다")
+
+# 프로파일 조회 API (관리자 전용)
+@app.get("/admin/profiles")
+async def list_profiles(request: Request):
+    require_admin(request)
+    return {"profiles": profile_store.list()}
+
+@app.get("/admin/profiles/{profile_id}")
+async def get_profile(request: Request, profile_id: str):
+    require_admin(request)
+    profile = profile_store.get(profile_id)
+    if not profile:
+        raise HTTPException(status_code=404, detail="프로파일을 찾을 수 없습니다")
+    return profile
+
 # 프록시 라우트 - 모든 경로를 처리
 @app.api_route("/{path:path}", methods=["GET", "POST", "PUT", "DELETE", "PATCH"])
 async def proxy_route(request: Request, path: str):
-    return await proxy_service.forward_request(request, f"/{path}")
+    wants_profile = request.headers.get(PROFILE_HEADER) == "1" or PROFILE_QUERY_PARAM in request.query_params
+    if not (wants_profile and request_profiler.is_authorized(request.headers.get(ADMIN_TOKEN_HEADER))):
+        return await proxy_service.forward_request(request, f"/{path}")
+
+    with request_profiler.profile(request.method, f"/{path}") as profile:
+        try:
+            response = await proxy_service.forward_request(request, f"/{path}")
+        except HTTPException as e:
+            response = JSONResponse(content={"detail": e.detail}, status_code=e.status_code, headers=e.headers)
+    if profile["id"]:
+        response.headers["X-Profile-Id"] = profile["id"]
+    return response
 
 # 루트 경로
 @app.get("/")
@@ -260,4 +564,4 @@ async def root():
 if __name__ == "__main__":
     import uvicorn
     port = int(os.getenv("PORT", 8000))
-    uvicorn.run(app, host="0.0.0.0", port=port)
+    uvicorn.run(app, host="0.0.0.0", port=port, log_config=None, access_log=False)
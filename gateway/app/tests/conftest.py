@@ -0,0 +1,5 @@
+import os
+import sys
+
+# 게이트웨이 common 패키지 경로 추가
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
@@ -0,0 +1,74 @@
+import io
+import logging
+import queue
+
+from common import access_log
+from common.access_log import AccessLogger, BatchingQueueListener, DroppingQueueHandler
+
+
+class CountingStream(io.StringIO):
+    def __init__(self):
+        super().__init__()
+        self.writes = 0
+
+    def write(self, text):
+        self.writes += 1
+        return super().write(text)
+
+
+def make_record(message: str, level: int = logging.INFO) -> logging.LogRecord:
+    return logging.LogRecord("test", level, __file__, 0, message, None, None)
+
+
+def test_sampling_keeps_every_error(monkeypatch):
+    logger = AccessLogger(sample_rate=0.1)
+    monkeypatch.setattr(access_log.random, "random", lambda: 0.5)
+    assert not logger.should_log(200)
+    assert logger.should_log(404)
+    assert logger.should_log(502)
+    assert logger.should_log(200, error="timeout")
+    monkeypatch.setattr(access_log.random, "random", lambda: 0.05)
+    assert logger.should_log(200)
+    assert AccessLogger(sample_rate=5).should_log(200)
+    assert not AccessLogger(sample_rate=0).should_log(200)
+
+
+def test_full_queue_drops_info_but_keeps_errors():
+    log_queue: queue.Queue = queue.Queue(maxsize=4)
+    handler = DroppingQueueHandler(log_queue, soft_limit=2)
+    for i in range(3):
+        handler.enqueue(make_record(f"info {i}"))
+    handler.enqueue(make_record("warning", logging.WARNING))
+    handler.enqueue(make_record("error", logging.ERROR))
+    handler.enqueue(make_record("error 2", logging.ERROR))
+    messages = [log_queue.get_nowait().msg for _ in range(log_queue.qsize())]
+    assert messages == ["info 0", "info 1", "warning", "error"]
+    assert handler.dropped == 2
+
+
+def test_listener_writes_in_batches():
+    log_queue: queue.Queue = queue.Queue()
+    stream = CountingStream()
+    for i in range(10):
+        log_queue.put(make_record(f"line {i}"))
+    listener = BatchingQueueListener(log_queue, stream=stream, formatter=logging.Formatter("%(message)s"),
+                                     batch_size=4)
+    listener.start()
+    listener.stop()
+    assert stream.getvalue().splitlines() == [f"line {i}" for i in range(10)]
+    assert stream.writes == 3
+
+
+def test_stop_flushes_pending_records():
+    log_queue: queue.Queue = queue.Queue()
+    stream = CountingStream()
+    listener = BatchingQueueListener(log_queue, stream=stream, formatter=logging.Formatter("%(message)s"),
+                                     flush_interval=10)
+    listener.start()
+    handler = DroppingQueueHandler(log_queue)
+    for i in range(5):
+        handler.enqueue(make_record(f"pending {i}"))
+    listener.stop()
+    assert stream.getvalue().splitlines() == [f"pending {i}" for i in range(5)]
+    # 두 번 호출해도 문제 없어야 함 (atexit 등록)
+    listener.stop()
@@ -0,0 +1,133 @@
+import asyncio
+import random
+
+import pytest
+
+from common import concurrency
+from common.concurrency import PRIORITY_HIGH, PRIORITY_LOW, PRIORITY_NORMAL, AdaptiveLimiter, Overloaded
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+def test_acquire_within_limit_and_release():
+    async def scenario():
+        limiter = AdaptiveLimiter("svc", initial_limit=2)
+        await limiter.acquire()
+        await limiter.acquire()
+        assert limiter.inflight == 2
+        limiter.release(0.01, True)
+        limiter.release(0.01, True)
+        assert limiter.inflight == 0
+        assert limiter.accepted == 2
+
+    run(scenario())
+
+
+def test_release_hands_slot_to_highest_priority_waiter():
+    async def scenario():
+        limiter = AdaptiveLimiter("svc", initial_limit=1, queue_timeout=5.0)
+        await limiter.acquire()
+        order = []
+
+        async def waiter(priority, name):
+            await limiter.acquire(priority)
+            order.append(name)
+
+        low = asyncio.create_task(waiter(PRIORITY_LOW, "low"))
+        await asyncio.sleep(0)
+        high = asyncio.create_task(waiter(PRIORITY_HIGH, "high"))
+        await asyncio.sleep(0)
+        assert limiter.queued == 2
+
+        limiter.release(0.01, True)
+        await high
+        assert order == ["high"]
+        # 슬롯은 반납 없이 그대로 넘겨짐
+        assert limiter.inflight == 1
+
+        limiter.release(0.01, True)
+        await low
+        assert order == ["high", "low"]
+
+    run(scenario())
+
+
+def test_full_queue_evicts_lower_priority_waiter():
+    async def scenario():
+        limiter = AdaptiveLimiter("svc", initial_limit=1, max_queue=1, queue_timeout=5.0)
+        await limiter.acquire()
+        low = asyncio.create_task(limiter.acquire(PRIORITY_LOW))
+        await asyncio.sleep(0)
+
+        high = asyncio.create_task(limiter.acquire(PRIORITY_HIGH))
+        await asyncio.sleep(0)
+        with pytest.raises(Overloaded):
+            await low
+
+        # 같거나 낮은 우선순위는 밀어내지 못하고 바로 거절
+        with pytest.raises(Overloaded):
+            await limiter.acquire(PRIORITY_NORMAL)
+
+        limiter.release(0.01, True)
+        await high
+        assert limiter.rejected == 2
+
+    run(scenario())
+
+
+def test_queue_timeout_rejects():
+    async def scenario():
+        limiter = AdaptiveLimiter("svc", initial_limit=1, queue_timeout=0.01)
+        await limiter.acquire()
+        with pytest.raises(Overloaded) as exc:
+            await limiter.acquire()
+        assert exc.value.retry_after >= 1
+        assert limiter.queued == 0
+
+    run(scenario())
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [0.0]
+    monkeypatch.setattr(concurrency.time, "monotonic", lambda: now[0])
+    return now
+
+
+def saturate(limiter, clock, latencies, ok=True):
+    for latency in latencies:
+        limiter.inflight = int(limiter.limit)
+        clock[0] += latency / limiter.limit
+        limiter._update_limit(latency, ok)
+
+
+def test_jitter_on_healthy_upstream_does_not_shrink_limit(clock):
+    rng = random.Random(1)
+    limiter = AdaptiveLimiter("svc", initial_limit=20)
+    saturate(limiter, clock, [rng.uniform(0.01, 0.03) for _ in range(5000)])
+    assert limiter.limit > 20
+
+
+def test_latency_spike_decreases_at_most_once_per_window(clock):
+    limiter = AdaptiveLimiter("svc", initial_limit=20)
+    saturate(limiter, clock, [0.02] * 200)
+    before = limiter.limit
+
+    # 같은 시각에 들어온 느린 응답들은 한 번만 줄임
+    for _ in range(10):
+        limiter._update_limit(0.5, True)
+    assert limiter.limit == pytest.approx(before * limiter.backoff)
+
+    clock[0] += 1.0
+    limiter._update_limit(0.5, True)
+    assert limiter.limit == pytest.approx(before * limiter.backoff ** 2)
+
+
+def test_errors_decrease_limit(clock):
+    limiter = AdaptiveLimiter("svc", initial_limit=20, min_limit=2)
+    for _ in range(100):
+        clock[0] += 1.0
+        limiter._update_limit(0.01, False)
+    assert limiter.limit == 2
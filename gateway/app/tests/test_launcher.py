@@ -0,0 +1,67 @@
+import launcher
+from launcher import Supervisor
+
+
+class FakeProcess:
+    def __init__(self, exitcode=None):
+        self.exitcode = exitcode
+        self.pid = 0
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+def make_supervisor(monkeypatch, workers: int):
+    clock = FakeClock()
+    monkeypatch.setattr(launcher.time, "monotonic", clock)
+    supervisor = Supervisor("127.0.0.1", 0, workers)
+    spawned = []
+
+    def spawn(index):
+        spawned.append(index)
+        supervisor.processes[index] = FakeProcess()
+        supervisor.started_at[index] = clock.now
+
+    supervisor.spawn = spawn
+    for index in range(workers):
+        spawn(index)
+    spawned.clear()
+    return supervisor, clock, spawned
+
+
+def test_backoff_does_not_block_other_restarts(monkeypatch):
+    supervisor, clock, spawned = make_supervisor(monkeypatch, 2)
+
+    # 시작 직후 죽은 워커 0은 1초 뒤 재시작 예약, 감시 루프는 바로 반환
+    supervisor.processes[0].exitcode = 1
+    supervisor.check_workers()
+    assert supervisor.processes[0] is None
+    assert spawned == []
+
+    # 오래 실행된 워커 1은 대기 없이 다음 점검에서 재시작
+    clock.now += 0.5
+    supervisor.started_at[1] = clock.now - 60
+    supervisor.processes[1].exitcode = 1
+    supervisor.check_workers()
+    supervisor.check_workers()
+    assert spawned == [1]
+
+    clock.now += 0.5
+    supervisor.check_workers()
+    assert spawned == [1, 0]
+    assert list(supervisor.stats.restarts) == [1, 1]
+
+
+def test_pending_restart_is_dropped_on_exit(monkeypatch):
+    supervisor, clock, spawned = make_supervisor(monkeypatch, 1)
+    supervisor.processes[0].exitcode = 1
+    supervisor.check_workers()
+    supervisor.should_exit = True
+    clock.now += 60
+    supervisor.check_workers()
+    assert spawned == []
@@ -0,0 +1,86 @@
+import asyncio
+import os
+import time
+
+import pytest
+
+from common.profiling import LoopLagMonitor, ProfileStore, RequestProfiler
+
+
+def make_entry(created_at: float):
+    return {"method": "GET", "path": "/api/users", "created_at": created_at, "stats": "..."}
+
+
+def test_memory_store_keeps_latest_entries():
+    store = ProfileStore(max_entries=2)
+    ids = [store.add(make_entry(i)) for i in range(3)]
+    assert store.get(ids[0]) is None
+    assert [entry["id"] for entry in store.list()] == [ids[2], ids[1]]
+    assert "stats" not in store.list()[0]
+
+
+def test_file_store_is_shared_between_instances(tmp_path):
+    writer = ProfileStore(max_entries=2, directory=str(tmp_path))
+    reader = ProfileStore(max_entries=2, directory=str(tmp_path))
+    ids = []
+    for i in range(3):
+        ids.append(writer.add(make_entry(i)))
+        # 정리 순서가 mtime 해상도에 좌우되지 않도록 시각을 명시
+        path = tmp_path / f"{ids[-1]}.json"
+        os.utime(path, (i, i))
+    assert reader.get(ids[2])["path"] == "/api/users"
+    assert reader.get(ids[0]) is None
+    assert [entry["id"] for entry in reader.list()] == [ids[2], ids[1]]
+    assert not [name for name in os.listdir(tmp_path) if name.endswith(".tmp")]
+
+
+@pytest.mark.parametrize("profile_id", ["../secret", "a/b", "", "abc.json"])
+def test_file_store_rejects_non_alphanumeric_ids(tmp_path, profile_id):
+    store = ProfileStore(directory=str(tmp_path / "profiles"))
+    (tmp_path / "secret.json").write_text('{"leak": true}')
+    assert store.get(profile_id) is None
+
+
+def test_profile_entry_is_labelled_loop_wide():
+    store = ProfileStore()
+    profiler = RequestProfiler(store, admin_token="token")
+    assert profiler.is_authorized("token")
+    assert not profiler.is_authorized("other")
+    with profiler.profile("GET", "/api/users") as outer:
+        with profiler.profile("GET", "/api/products") as inner:
+            pass
+    assert inner["id"] is None
+    entry = store.get(outer["id"])
+    assert entry["scope"] == "event_loop"
+    assert entry["path"] == "/api/users"
+
+
+def test_loop_lag_monitor_records_blocking(caplog):
+    monitor = LoopLagMonitor(interval=0.01, threshold=0.05)
+
+    async def scenario():
+        monitor.start()
+        await asyncio.sleep(0.03)
+        # 루프를 막아 지연을 만듦
+        time.sleep(0.1)
+        await asyncio.sleep(0.03)
+        await monitor.stop()
+
+    asyncio.run(scenario())
+    snapshot = monitor.snapshot()
+    assert snapshot["samples"] >= 2
+    assert snapshot["slow_count"] >= 1
+    assert snapshot["max_lag_ms"] >= 50
+    assert monitor._task is None
+    assert any("이벤트 루프 지연" in record.getMessage() for record in caplog.records)
+
+
+def test_loop_lag_monitor_averages():
+    monitor = LoopLagMonitor(threshold=1.0)
+    monitor.record(0.1)
+    monitor.record(0.0)
+    snapshot = monitor.snapshot()
+    assert snapshot["last_lag_ms"] == 0.0
+    assert snapshot["avg_lag_ms"] == 90.0
+    assert snapshot["max_lag_ms"] == 100.0
+    assert snapshot["slow_count"] == 0
@@ -0,0 +1,123 @@
+import asyncio
+from types import SimpleNamespace
+
+import httpx
+from fastapi.testclient import TestClient
+
+from common.warmup import Warmup, parse_warmup_requests
+
+
+class FakeDiscovery:
+    """순서대로 정해진 헬스 체크 결과를 돌려주는 디스커버리"""
+
+    def __init__(self, *results):
+        self.registry = SimpleNamespace(
+            get_all_services=lambda: self.services,
+            get_service=lambda name: self.services.get(name),
+        )
+        self.services = {
+            "user-service": SimpleNamespace(url="http://127.0.0.1:8001", health_check="/health"),
+        }
+        self.results = list(results)
+
+    async def health_check_all(self):
+        return self.results.pop(0) if len(self.results) > 1 else self.results[0]
+
+    def get_service_name_by_path(self, path):
+        return "user-service" if path.startswith("/api/users") else None
+
+
+def make_client(seen, slow_paths=()):
+    async def handler(request):
+        seen.append(request.url.path)
+        if request.url.path in slow_paths:
+            await asyncio.sleep(60)
+        return httpx.Response(200)
+
+    return httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+
+def run(warmup, discovery, client):
+    async def scenario():
+        async with client:
+            await warmup.run(discovery, client)
+
+    asyncio.run(scenario())
+
+
+def test_parse_warmup_requests():
+    assert parse_warmup_requests("GET /api/products, /api/users/1 ,post /x,") == [
+        ("GET", "/api/products"), ("GET", "/api/users/1"), ("POST", "/x")
+    ]
+
+
+def test_ready_after_healthy_warmup_and_replay():
+    seen = []
+    warmup = Warmup(timeout=5, connections=2, requests=[("GET", "/api/users/1"), ("GET", "/api/other")])
+    run(warmup, FakeDiscovery({"user-service": True}), make_client(seen))
+    assert warmup.ready
+    assert warmup.phase == "done"
+    assert seen == ["/health", "/health", "/api/users/1"]
+    assert warmup.errors == ["skip GET /api/other: no healthy service"]
+
+
+def test_stays_not_ready_when_no_upstream_is_healthy():
+    warmup = Warmup(timeout=0.3, connections=1)
+    run(warmup, FakeDiscovery({"user-service": False}), make_client([]))
+    assert not warmup.ready
+    assert warmup.phase == "done"
+    assert "timed out" in warmup.errors[-1]
+
+    # 이후 주기 헬스 체크에서 정상 업스트림이 확인되면 준비 완료
+    warmup.update_health({"user-service": True})
+    assert warmup.ready
+
+
+def test_ready_without_require_healthy_even_if_unhealthy():
+    warmup = Warmup(timeout=5, connections=1, require_healthy=False)
+    run(warmup, FakeDiscovery({"user-service": False}), make_client([]))
+    assert warmup.ready
+
+
+def test_failure_does_not_mark_ready():
+    discovery = FakeDiscovery({"user-service": True})
+    discovery.registry.get_all_services = lambda: 1 / 0
+    warmup = Warmup(timeout=5)
+    run(warmup, discovery, make_client([]))
+    assert not warmup.ready
+    assert warmup.errors == ["division by zero"]
+
+
+def test_whole_run_is_bounded_by_timeout():
+    warmup = Warmup(timeout=0.3, connections=1, requests=[("GET", "/api/users/slow")])
+    started = asyncio.run(_timed(warmup, FakeDiscovery({"user-service": True}),
+                                 make_client([], slow_paths={"/api/users/slow"})))
+    assert started < 5
+    assert "in replay" in warmup.errors[-1]
+    # 헬스 체크에서 정상으로 확인됐으므로 준비 완료
+    assert warmup.ready
+
+
+async def _timed(warmup, discovery, client):
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+    async with client:
+        await warmup.run(discovery, client)
+    return loop.time() - started
+
+
+def test_ready_endpoint_follows_warmup(monkeypatch):
+    import main
+
+    warmup = Warmup()
+    monkeypatch.setattr(main, "warmup", warmup)
+    client = TestClient(main.app)
+    response = client.get("/ready")
+    assert response.status_code == 503
+    assert response.json()["status"] == "not_ready"
+
+    warmup.phase = "done"
+    warmup.update_health({"user-service": True})
+    response = client.get("/ready")
+    assert response.status_code == 200
+    assert response.json()["warmup"]["ready"] is True
@@ -0,0 +1,123 @@
+import multiprocessing
+
+from common.worker_stats import SLOT_SIZE, WorkerStats, aggregate
+
+
+def publish_from_child(buffer, versions, restarts, carried):
+    stats = WorkerStats()
+    stats.bind(2, buffer, versions, restarts, carried, 1)
+    stats.requests = 7
+    stats.publish({"ready": True})
+
+
+class TornBuffer:
+    """첫 번째 읽기 도중 다른 쓰기가 끝난 것처럼 버전을 올리는 버퍼"""
+
+    def __init__(self, buffer, versions):
+        self.buffer = buffer
+        self.versions = versions
+        self.reads = 0
+
+    def __getitem__(self, key):
+        self.reads += 1
+        if self.reads == 1:
+            self.versions[0] += 2
+        return self.buffer[key]
+
+
+def test_publish_and_read_slot():
+    stats = WorkerStats()
+    stats.record_request(200)
+    stats.record_request(503)
+    stats.publish({"ready": True})
+
+    snapshot = stats.read_slot(0)
+    assert snapshot["requests"] == 2
+    assert snapshot["errors"] == 1
+    assert snapshot["ready"] is True
+    assert snapshot["restarts"] == 0
+    assert stats.versions[0] % 2 == 0
+
+
+def test_unwritten_and_in_progress_slots_are_skipped():
+    stats = WorkerStats(slots=2)
+    assert stats.read_all() == []
+
+    stats.publish({})
+    # 홀수 버전 = 쓰는 중
+    stats.versions[0] += 1
+    assert stats.read_slot(0) is None
+    stats.versions[0] += 1
+    assert stats.read_slot(0) is not None
+
+
+def test_read_retries_when_version_changes_mid_read():
+    stats = WorkerStats()
+    stats.publish({"ready": True})
+    stats.buffer = TornBuffer(stats.buffer, stats.versions)
+
+    snapshot = stats.read_slot(0)
+    assert snapshot is not None
+    assert stats.buffer.reads == 2
+
+
+def test_shorter_snapshot_does_not_leave_stale_bytes():
+    stats = WorkerStats()
+    stats.publish({"padding": "x" * 1000})
+    stats.publish({})
+    assert "padding" not in stats.read_slot(0)
+
+
+def test_oversize_snapshot_is_not_published():
+    stats = WorkerStats()
+    stats.publish({"ready": True})
+    stats.publish({"padding": "x" * SLOT_SIZE})
+    assert "padding" not in stats.read_slot(0)
+    assert stats.versions[0] == 2
+
+
+def test_workers_share_slots_across_processes():
+    ctx = multiprocessing.get_context("spawn")
+    master = WorkerStats.create_shared(ctx, 2)
+    local = WorkerStats()
+    local.bind(2, *master.shared_arrays(), 0)
+    local.requests = 3
+    local.publish({"ready": False})
+
+    process = ctx.Process(target=publish_from_child, args=master.shared_arrays())
+    process.start()
+    process.join(30)
+    assert process.exitcode == 0
+
+    snapshots = master.read_all()
+    assert sorted(s["index"] for s in snapshots) == [0, 1]
+    totals = aggregate(snapshots, stale_after=60)
+    assert totals["requests"] == 10
+    assert totals["alive_workers"] == 2
+
+
+def test_counters_survive_worker_restart():
+    master = WorkerStats(slots=2)
+    worker = WorkerStats()
+    worker.bind(2, *master.shared_arrays(), 1)
+    for status_code in (200, 500, 200):
+        worker.record_request(status_code)
+    worker.record_shed()
+    worker.publish({})
+
+    master.carry_over(1)
+    # 새 워커가 첫 스냅샷을 쓰기 전에는 이전 값이 이중 집계되지 않음
+    assert master.read_slot(1) is None
+
+    restarted = WorkerStats()
+    restarted.bind(2, *master.shared_arrays(), 1)
+    restarted.record_request(200)
+    restarted.publish({})
+    snapshot = master.read_slot(1)
+    assert (snapshot["requests"], snapshot["errors"], snapshot["shed"]) == (4, 1, 1)
+
+    # 두 번째 재시작에서도 이전 보관분이 유지됨
+    master.carry_over(1)
+    WorkerStats(slots=2, buffer=master.buffer, versions=master.versions, restarts=master.restarts,
+                carried=master.carried, index=1).publish({})
+    assert aggregate(master.read_all(), stale_after=60)["requests"] == 4
@@ -1,9 +1,24 @@
-from fastapi import FastAPI, HTTPException
-from pydantic import BaseModel
-from typing import List, Optional
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, Field
+from typing import Deque, Dict, List, Literal, Optional, Set, get_args
+from collections import deque
 from datetime import datetime
+import asyncio
+import json
 import logging
 import os
+import sys
+import time
+
+# 공유 모듈(services/shared) 경로 추가; 컨테이너에서는 /app/shared로 복사됨
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
+from shared.idempotency import IdempotencyMiddleware, IdempotencyStore
+from shared.ids import IdAllocator
+from shared.ndjson import export_ndjson, import_ndjson
+
+from order_store import create_order_store
 
 # 로깅 설정
 logging.basicConfig(level=logging.INFO)
@@ -16,12 +31,86 @@ app = FastAPI(
     version="1.0.0"
 )
 
-# 샘플 주문 데이터
-orders = [
+# Idempotency-Key 처리 (재시도로 인한 중복 생성 방지)
+idempotency_store = IdempotencyStore(
+    max_entries=int(os.getenv("IDEMPOTENCY_MAX_KEYS", "10000")),
+    ttl=float(os.getenv("IDEMPOTENCY_TTL_SECONDS", "86400"))
+)
+app.add_middleware(IdempotencyMiddleware, store=idempotency_store)
+
+# 샘플 주문 데이터 (ORDER_STORE=columnar 이면 압축 컬럼 저장소 사용)
+orders = create_order_store(os.getenv("ORDER_STORE", "list"), [
     {"id": 1, "user_id": 1, "product_id": 101, "quantity": 2, "total_price": 50000, "status": "pending", "created_at": "2024-01-15T10:30:00"},
     {"id": 2, "user_id": 2, "product_id": 102, "quantity": 1, "total_price": 30000, "status": "completed", "created_at": "2024-01-14T15:20:00"},
     {"id": 3, "user_id": 3, "product_id": 103, "quantity": 3, "total_price": 75000, "status": "shipped", "created_at": "2024-01-13T09:45:00"}
-]
+])
+
+# id 발급기 (생성 API와 NDJSON 가져오기가 함께 사용)
+order_ids = IdAllocator(orders.ids())
+
+# 주문 상태 변경 이벤트 허브 (사용자별 팬아웃 + 재연결 시 이어받기용 버퍼)
+class OrderEventHub:
+    def __init__(self, history_size: int = 1000, subscriber_queue_size: int = 100):
+        self.history: Deque[Dict] = deque(maxlen=history_size)
+        self.subscribers: Dict[int, Set[asyncio.Queue]] = {}
+        self.subscriber_queue_size = subscriber_queue_size
+        # 재시작 후에도 이전 부팅의 id와 겹치지 않도록 부팅 시각(마이크로초)부터 시작
+        self.last_id = time.time_ns() // 1000
+    
+    def publish(self, order: Dict, event_type: str = "status_changed"):
+        self.last_id += 1
+        event = {
+            "id": self.last_id,
+            "event": event_type,
+            "user_id": order["user_id"],
+            "data": {"order_id": order["id"], "status": order["status"]}
+        }
+        self.history.append(event)
+        for queue in list(self.subscribers.get(order["user_id"], ())):
+            try:
+                queue.put_nowait(event)
+            except asyncio.QueueFull:
+                # 처리하지 못하는 구독자는 끊고 Last-Event-ID로 재연결하도록 함
+                self.unsubscribe(order["user_id"], queue)
+                while not queue.empty():
+                    queue.get_nowait()
+                queue.put_nowait(None)
+    
+    def subscribe(self, user_id: int) -> asyncio.Queue:
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.subscriber_queue_size)
+        self.subscribers.setdefault(user_id, set()).add(queue)
+        return queue
+    
+    def unsubscribe(self, user_id: int, queue: asyncio.Queue):
+        queues = self.subscribers.get(user_id)
+        if queues is not None:
+            queues.discard(queue)
+            if not queues:
+                del self.subscribers[user_id]
+    
+    def can_resume(self, last_event_id: int) -> bool:
+        # 다른 부팅에서 받은 id이거나 버퍼에서 이미 밀려난 구간이면 놓친 이벤트를 재생할 수 없음
+        oldest_id = self.history[0]["id"] if self.history else self.last_id + 1
+        return oldest_id - 1 <= last_event_id <= self.last_id
+    
+    def reset_event(self, user_id: int) -> Dict:
+        # 클라이언트는 목록을 다시 조회하고 이 id부터 이어받음
+        return {"id": self.last_id, "event": "reset", "user_id": user_id, "data": {"reason": "history_unavailable"}}
+    
+    def replay(self, user_id: int, last_event_id: int) -> List[Dict]:
+        return [e for e in self.history if e["id"] > last_event_id and e["user_id"] == user_id]
+    
+    def subscriber_count(self) -> int:
+        return sum(len(queues) for queues in self.subscribers.values())
+
+def format_sse(event: Dict) -> str:
+    return f"id: {event['id']}\nevent: {event['event']}\ndata: {json.dumps(event['data'])}\n\n"
+
+event_hub = OrderEventHub(
+    history_size=int(os.getenv("ORDER_EVENT_HISTORY", "1000")),
+    subscriber_queue_size=int(os.getenv("ORDER_EVENT_QUEUE_SIZE", "100"))
+)
+SSE_KEEPALIVE_SECONDS = float(os.getenv("SSE_KEEPALIVE_SECONDS", "15"))
 
 class Order(BaseModel):
     id: int
@@ -38,13 +127,25 @@ class CreateOrder(BaseModel):
     quantity: int
     total_price: float
 
+OrderStatus = Literal["pending", "processing", "shipped", "completed", "cancelled"]
+
+class ImportOrder(CreateOrder):
+    id: Optional[int] = None
+    status: OrderStatus = "pending"
+    created_at: datetime = Field(default_factory=datetime.now)
+
+# NDJSON 대량 가져오기/내보내기
+NDJSON_CHUNK_SIZE = int(os.getenv("NDJSON_CHUNK_SIZE", "1000"))
+IMPORT_MAX_ERRORS = int(os.getenv("IMPORT_MAX_ERRORS", "1000"))
+
 @app.get("/health")
 async def health_check():
     """서비스 헬스 체크"""
     return {
         "status": "healthy",
         "service": "order-service",
-        "port": os.getenv("SERVICE_PORT", "8002")
+        "port": os.getenv("SERVICE_PORT", "8002"),
+        "event_subscribers": event_hub.subscriber_count()
     }
 
 @app.get("/")
@@ -55,26 +156,77 @@ async def root():
 @app.get("/api/orders", response_model=List[Order])
 async def get_orders():
     """모든 주문 조회"""
-    return orders
+    return orders.all()
+
+@app.get("/api/orders/export")
+async def export_orders():
+    """주문 전체를 NDJSON으로 내보내기"""
+    return export_ndjson(orders, NDJSON_CHUNK_SIZE)
+
+@app.post("/api/orders/import")
+async def import_orders(request: Request):
+    """NDJSON 주문 대량 가져오기 (id가 없으면 새로 부여)"""
+    return await import_ndjson(request, orders, ImportOrder, order_ids, NDJSON_CHUNK_SIZE, IMPORT_MAX_ERRORS)
 
 @app.get("/api/orders/{order_id}", response_model=Order)
 async def get_order(order_id: int):
     """특정 주문 조회"""
-    for order in orders:
-        if order["id"] == order_id:
-            return order
+    order = orders.get(order_id)
+    if order is not None:
+        return order
     raise HTTPException(status_code=404, detail="Order not found")
 
 @app.get("/api/orders/user/{user_id}", response_model=List[Order])
 async def get_orders_by_user(user_id: int):
     """사용자별 주문 조회"""
-    user_orders = [order for order in orders if order["user_id"] == user_id]
-    return user_orders
+    return orders.by_user(user_id)
+
+@app.get("/api/orders/user/{user_id}/events")
+async def stream_order_events(user_id: int, request: Request, last_event_id: Optional[int] = None):
+    """사용자별 주문 상태 변경 SSE 스트림 (Last-Event-ID로 이어받기)"""
+    header_id = request.headers.get("last-event-id")
+    if header_id and header_id.isdigit():
+        last_event_id = int(header_id)
+    
+    async def event_stream():
+        # 스트림이 시작되지 않으면 구독하지 않도록 제너레이터 안에서 구독
+        queue = event_hub.subscribe(user_id)
+        # 구독 후 재생 전에 발행된 이벤트는 큐와 재생 양쪽에 있으므로 이미 보낸 id 이하는 건너뜀
+        sent_id = event_hub.last_id if last_event_id is None else last_event_id
+        try:
+            if last_event_id is not None and not event_hub.can_resume(last_event_id):
+                event = event_hub.reset_event(user_id)
+                sent_id = event["id"]
+                yield format_sse(event)
+            elif last_event_id is not None:
+                for event in event_hub.replay(user_id, last_event_id):
+                    sent_id = event["id"]
+                    yield format_sse(event)
+            yield ": connected\n\n"
+            while True:
+                try:
+                    event = await asyncio.wait_for(queue.get(), timeout=SSE_KEEPALIVE_SECONDS)
+                except asyncio.TimeoutError:
+                    yield ": keepalive\n\n"
+                    continue
+                if event is None:
+                    return
+                if event["id"] <= sent_id:
+                    continue
+                yield format_sse(event)
+        finally:
+            event_hub.unsubscribe(user_id, queue)
+    
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
 
 @app.post("/api/orders", response_model=Order)
 async def create_order(order: CreateOrder):
     """새 주문 생성"""
-    new_id = max([o["id"] for o in orders]) + 1 if orders else 1
+    new_id = order_ids.allocate()
     new_order = {
         "id": new_id,
         **order.dict(),
@@ -82,28 +234,27 @@ async def create_order(order: CreateOrder):
         "created_at": datetime.now().isoformat()
     }
     orders.append(new_order)
+    event_hub.publish(new_order, "created")
     return new_order
 
 @app.put("/api/orders/{order_id}/status")
 async def update_order_status(order_id: int, status: str):
     """주문 상태 업데이트"""
-    valid_statuses = ["pending", "processing", "shipped", "completed", "cancelled"]
-    if status not in valid_statuses:
+    if status not in get_args(OrderStatus):
         raise HTTPException(status_code=400, detail="Invalid status")
     
-    for i, order in enumerate(orders):
-        if order["id"] == order_id:
-            orders[i]["status"] = status
-            return {"message": f"Order {order_id} status updated to {status}"}
+    order = orders.set_status(order_id, status)
+    if order is not None:
+        event_hub.publish(order)
+        return {"message": f"Order {order_id} status updated to {status}"}
     raise HTTPException(status_code=404, detail="Order not found")
 
 @app.delete("/api/orders/{order_id}")
 async def delete_order(order_id: int):
     """주문 삭제"""
-    for i, order in enumerate(orders):
-        if order["id"] == order_id:
-            deleted_order = orders.pop(i)
-            return {"message": f"Order {deleted_order['id']} deleted successfully"}
+    deleted_order = orders.delete(order_id)
+    if deleted_order is not None:
+        return {"message": f"Order {deleted_order['id']} deleted successfully"}
     raise HTTPException(status_code=404, detail="Order not found")
 
 if __name__ == "__main__":
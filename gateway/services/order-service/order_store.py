@@ -0,0 +1,242 @@
+from array import array
+from bisect import bisect_left
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+EPOCH = datetime(1970, 1, 1)
+
+
+def scan_equal(column: array, value: int) -> List[int]:
+    """컬럼에서 value와 같은 행 번호 목록
+
+    컬럼 버퍼에서 값의 바이트 패턴을 bytes.find로 찾아 C 수준으로 스캔하고,
+    원소 경계에 맞지 않는 위치는 건너뜁니다.
+    """
+    try:
+        needle = array(column.typecode, [value]).tobytes()
+    except OverflowError:
+        return []
+    size = column.itemsize
+    data = column.tobytes()
+    rows = []
+    pos = data.find(needle)
+    while pos != -1:
+        if pos % size == 0:
+            rows.append(pos // size)
+            pos = data.find(needle, pos + size)
+        else:
+            pos = data.find(needle, pos + 1)
+    return rows
+
+
+class ListOrderStore:
+    """주문을 dict 리스트로 보관하는 기본 저장소"""
+
+    def __init__(self, rows: Iterable[Dict] = ()):
+        self.rows: List[Dict] = list(rows)
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def __iter__(self) -> Iterator[Dict]:
+        return iter(self.rows)
+
+    def __getitem__(self, index):
+        return self.rows[index]
+
+    def ids(self) -> Iterable[int]:
+        return (order["id"] for order in self.rows)
+
+    def append(self, order: Dict):
+        self.rows.append(order)
+
+    def extend(self, orders: Iterable[Dict]):
+        self.rows.extend(orders)
+
+    def all(self) -> List[Dict]:
+        return self.rows
+
+    def get(self, order_id: int) -> Optional[Dict]:
+        for order in self.rows:
+            if order["id"] == order_id:
+                return order
+        return None
+
+    def by_user(self, user_id: int) -> List[Dict]:
+        return [order for order in self.rows if order["user_id"] == user_id]
+
+    def set_status(self, order_id: int, status: str) -> Optional[Dict]:
+        order = self.get(order_id)
+        if order is not None:
+            order["status"] = status
+        return order
+
+    def delete(self, order_id: int) -> Optional[Dict]:
+        for i, order in enumerate(self.rows):
+            if order["id"] == order_id:
+                return self.rows.pop(i)
+        return None
+
+
+class ColumnarOrderStore:
+    """주문을 타입 배열 컬럼으로 보관하는 압축 저장소
+
+    - id, user_id, product_id, quantity, total_price: array 컬럼 (정수 가격 여부는 1바이트 플래그)
+    - status: 상태 문자열 테이블의 1바이트 코드
+    - created_at: 표기된 시각의 epoch 기준 마이크로초 정수 + 시간대 표기 테이블의 1바이트 코드
+    응답 시점에만 dict로 변환하며, 입력과 같은 값(시간대 오프셋, 정수/실수 가격)으로 돌려줍니다.
+    """
+
+    def __init__(self, rows: Iterable[Dict] = ()):
+        self.order_ids = array("q")
+        self.user_ids = array("q")
+        self.product_ids = array("q")
+        self.quantities = array("q")
+        self.total_prices = array("d")
+        self.int_prices = array("B")
+        self.status_codes = array("B")
+        self.created_at = array("q")
+        self.tz_codes = array("B")
+        self.statuses: List[str] = []
+        self._status_index: Dict[str, int] = {}
+        # 시간대 표기 ("" = naive, "Z", "+09:00" 등)
+        self.tz_suffixes: List[str] = []
+        self._tz_index: Dict[str, int] = {}
+        # id가 오름차순으로만 추가되었으면 이진 탐색 사용
+        self._ids_sorted = True
+        self.extend(rows)
+
+    def __len__(self) -> int:
+        return len(self.order_ids)
+
+    def __iter__(self) -> Iterator[Dict]:
+        for i in range(len(self.order_ids)):
+            yield self._row(i)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._row(i) for i in range(*index.indices(len(self.order_ids)))]
+        if index < 0:
+            index += len(self.order_ids)
+        return self._row(index)
+
+    def ids(self) -> Iterable[int]:
+        return self.order_ids
+
+    def _columns(self):
+        return (self.order_ids, self.user_ids, self.product_ids, self.quantities, self.total_prices,
+                self.int_prices, self.status_codes, self.created_at, self.tz_codes)
+
+    @staticmethod
+    def _intern(table: List[str], index: Dict[str, int], value: str, what: str) -> int:
+        code = index.get(value)
+        if code is None:
+            if len(table) >= 256:
+                raise ValueError(f"too many distinct {what}")
+            code = len(table)
+            table.append(value)
+            index[value] = code
+        return code
+
+    def _status_code(self, status: str) -> int:
+        return self._intern(self.statuses, self._status_index, status, "order statuses")
+
+    @staticmethod
+    def _encode_price(value) -> Tuple[float, int]:
+        if isinstance(value, int):
+            # double로 정확히 표현되는 범위의 정수만 허용
+            if abs(value) > 2 ** 53:
+                raise OverflowError("integer total_price too large")
+            return float(value), 1
+        return value, 0
+
+    def _encode_time(self, value: str) -> Tuple[int, int]:
+        # 시간대는 UTC로 바꾸지 않고 표기 그대로 보관해 같은 문자열로 돌려줌
+        dt = datetime.fromisoformat(value)
+        suffix = ""
+        if dt.tzinfo is not None:
+            suffix = "Z" if value.endswith("Z") else dt.isoformat()[len(dt.replace(tzinfo=None).isoformat()):]
+            dt = dt.replace(tzinfo=None)
+        micros = (dt - EPOCH) // timedelta(microseconds=1)
+        return micros, self._intern(self.tz_suffixes, self._tz_index, suffix, "time zone offsets")
+
+    def _decode_time(self, value: int, tz_code: int) -> str:
+        return (EPOCH + timedelta(microseconds=value)).isoformat() + self.tz_suffixes[tz_code]
+
+    def _row(self, i: int) -> Dict:
+        return {
+            "id": self.order_ids[i],
+            "user_id": self.user_ids[i],
+            "product_id": self.product_ids[i],
+            "quantity": self.quantities[i],
+            "total_price": int(self.total_prices[i]) if self.int_prices[i] else self.total_prices[i],
+            "status": self.statuses[self.status_codes[i]],
+            "created_at": self._decode_time(self.created_at[i], self.tz_codes[i]),
+        }
+
+    def _find(self, order_id: int) -> Optional[int]:
+        if self._ids_sorted:
+            i = bisect_left(self.order_ids, order_id)
+            return i if i < len(self.order_ids) and self.order_ids[i] == order_id else None
+        try:
+            return self.order_ids.index(order_id)
+        except ValueError:
+            return None
+
+    def append(self, order: Dict):
+        values = (
+            order["id"], order["user_id"], order["product_id"], order["quantity"],
+            *self._encode_price(order["total_price"]), self._status_code(order["status"]),
+            *self._encode_time(order["created_at"])
+        )
+        appended = []
+        try:
+            for column, value in zip(self._columns(), values):
+                column.append(value)
+                appended.append(column)
+        except (OverflowError, TypeError):
+            # 범위를 벗어난 값이면 컬럼 길이가 어긋나지 않도록 되돌림
+            for column in appended:
+                column.pop()
+            raise
+        if len(self.order_ids) > 1 and order["id"] <= self.order_ids[-2]:
+            self._ids_sorted = False
+
+    def extend(self, orders: Iterable[Dict]):
+        for order in orders:
+            self.append(order)
+
+    def all(self) -> List[Dict]:
+        return [self._row(i) for i in range(len(self.order_ids))]
+
+    def has_id(self, order_id: int) -> bool:
+        return self._find(order_id) is not None
+
+    def get(self, order_id: int) -> Optional[Dict]:
+        i = self._find(order_id)
+        return self._row(i) if i is not None else None
+
+    def by_user(self, user_id: int) -> List[Dict]:
+        return [self._row(i) for i in scan_equal(self.user_ids, user_id)]
+
+    def set_status(self, order_id: int, status: str) -> Optional[Dict]:
+        i = self._find(order_id)
+        if i is None:
+            return None
+        self.status_codes[i] = self._status_code(status)
+        return self._row(i)
+
+    def delete(self, order_id: int) -> Optional[Dict]:
+        i = self._find(order_id)
+        if i is None:
+            return None
+        row = self._row(i)
+        for column in self._columns():
+            del column[i]
+        return row
+
+
+def create_order_store(kind: str, rows: Iterable[Dict] = ()):
+    if kind == "columnar":
+        return ColumnarOrderStore(rows)
+    return ListOrderStore(rows)
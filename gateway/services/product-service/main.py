@@ -1,8 +1,16 @@
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Request
 from pydantic import BaseModel
 from typing import List, Optional
 import logging
 import os
+import sys
+
+# 공유 모듈(services/shared) 경로 추가; 컨테이너에서는 /app/shared로 복사됨
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
+from shared.idempotency import IdempotencyMiddleware, IdempotencyStore
+from shared.ids import IdAllocator
+from shared.ndjson import export_ndjson, import_ndjson
 
 # 로깅 설정
 logging.basicConfig(level=logging.INFO)
@@ -15,6 +23,13 @@ app = FastAPI(
     version="1.0.0"
 )
 
+# Idempotency-Key 처리 (재시도로 인한 중복 생성 방지)
+idempotency_store = IdempotencyStore(
+    max_entries=int(os.getenv("IDEMPOTENCY_MAX_KEYS", "10000")),
+    ttl=float(os.getenv("IDEMPOTENCY_TTL_SECONDS", "86400"))
+)
+app.add_middleware(IdempotencyMiddleware, store=idempotency_store)
+
 # 샘플 상품 데이터
 products = [
     {"id": 101, "name": "노트북", "price": 25000, "category": "전자제품", "stock": 10, "description": "고성능 노트북"},
@@ -23,6 +38,9 @@ products = [
     {"id": 104, "name": "의자", "price": 15000, "category": "가구", "stock": 8, "description": "인체공학 의자"}
 ]
 
+# id 발급기 (생성 API와 NDJSON 가져오기가 함께 사용)
+product_ids = IdAllocator((p["id"] for p in products), first_id=101)
+
 class Product(BaseModel):
     id: int
     name: str
@@ -38,6 +56,13 @@ class CreateProduct(BaseModel):
     stock: int
     description: str
 
+class ImportProduct(CreateProduct):
+    id: Optional[int] = None
+
+# NDJSON 대량 가져오기/내보내기
+NDJSON_CHUNK_SIZE = int(os.getenv("NDJSON_CHUNK_SIZE", "1000"))
+IMPORT_MAX_ERRORS = int(os.getenv("IMPORT_MAX_ERRORS", "1000"))
+
 @app.get("/health")
 async def health_check():
     """서비스 헬스 체크"""
@@ -57,6 +82,16 @@ async def get_products():
     """모든 상품 조회"""
     return products
 
+@app.get("/api/products/export")
+async def export_products():
+    """상품 전체를 NDJSON으로 내보내기"""
+    return export_ndjson(products, NDJSON_CHUNK_SIZE)
+
+@app.post("/api/products/import")
+async def import_products(request: Request):
+    """NDJSON 상품 대량 가져오기 (id가 없으면 새로 부여)"""
+    return await import_ndjson(request, products, ImportProduct, product_ids, NDJSON_CHUNK_SIZE, IMPORT_MAX_ERRORS)
+
 @app.get("/api/products/{product_id}", response_model=Product)
 async def get_product(product_id: int):
     """특정 상품 조회"""
@@ -74,7 +109,7 @@ async def get_products_by_category(category: str):
 @app.post("/api/products", response_model=Product)
 async def create_product(product: CreateProduct):
     """새 상품 생성"""
-    new_id = max([p["id"] for p in products]) + 1 if products else 101
+    new_id = product_ids.allocate()
     new_product = {"id": new_id, **product.dict()}
     products.append(new_product)
     return new_product
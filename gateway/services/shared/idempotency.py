@@ -0,0 +1,144 @@
+import asyncio
+import hashlib
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional
+
+from fastapi import Response
+from fastapi.responses import JSONResponse
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+
+class IdempotencyStore:
+    """Idempotency-Key별 응답 보관 (TTL + 최대 개수, 오래된 키부터 제거)"""
+
+    def __init__(self, max_entries: int = 10000, ttl: float = 86400):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.entries: "OrderedDict[str, Dict]" = OrderedDict()
+        self.inflight: Dict[str, asyncio.Future] = {}
+
+    def get(self, key: str) -> Optional[Dict]:
+        entry = self.entries.get(key)
+        if entry is None:
+            return None
+        if entry["expires_at"] < time.monotonic():
+            del self.entries[key]
+            return None
+        return entry
+
+    def put(self, key: str, fingerprint: str, status_code: int, body: bytes, headers: Dict[str, str]):
+        self.entries[key] = {
+            "expires_at": time.monotonic() + self.ttl,
+            "fingerprint": fingerprint,
+            "status_code": status_code,
+            "body": body,
+            "headers": headers
+        }
+        self.entries.move_to_end(key)
+        # 오래된 키부터 제거
+        now = time.monotonic()
+        while self.entries and (len(self.entries) > self.max_entries
+                                or next(iter(self.entries.values()))["expires_at"] < now):
+            self.entries.popitem(last=False)
+
+
+def replay_response(entry: Dict) -> Response:
+    return Response(
+        content=entry["body"],
+        status_code=entry["status_code"],
+        headers={**entry["headers"], "Idempotent-Replayed": "true"}
+    )
+
+
+class IdempotencyMiddleware:
+    """POST 요청의 Idempotency-Key 처리 ASGI 미들웨어 (재시도로 인한 중복 생성 방지)
+
+        app.add_middleware(IdempotencyMiddleware, store=store)
+
+    POST가 아닌 요청(조회, SSE 스트림 등)은 그대로 통과시킵니다.
+    """
+
+    def __init__(self, app: ASGIApp, store: IdempotencyStore):
+        self.app = app
+        self.store = store
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http" or scope["method"] != "POST":
+            await self.app(scope, receive, send)
+            return
+        key = Headers(scope=scope).get("idempotency-key")
+        if not key or scope["path"].endswith("/import"):
+            await self.app(scope, receive, send)
+            return
+
+        store_key = f"{scope['path']}:{key}"
+        body = await read_body(receive)
+        if body is None:
+            return
+        fingerprint = hashlib.sha256(body).hexdigest()
+
+        # 같은 키의 원래 요청이 처리 중이면 끝날 때까지 기다림
+        while (pending := self.store.inflight.get(store_key)) is not None:
+            await asyncio.shield(pending)
+
+        entry = self.store.get(store_key)
+        if entry is not None:
+            if entry["fingerprint"] != fingerprint:
+                response = JSONResponse(status_code=422, content={"detail": "Idempotency-Key already used with a different request body"})
+            else:
+                response = replay_response(entry)
+            await response(scope, receive, send)
+            return
+
+        future = asyncio.get_running_loop().create_future()
+        self.store.inflight[store_key] = future
+        try:
+            status_code, headers, chunks = await self._call_app(scope, body, receive, send)
+            # 5xx는 저장하지 않아 재시도가 다시 실행되도록 함
+            if status_code is not None and status_code < 500:
+                self.store.put(store_key, fingerprint, status_code, b"".join(chunks), headers)
+        finally:
+            del self.store.inflight[store_key]
+            future.set_result(None)
+
+    async def _call_app(self, scope: Scope, body: bytes, receive: Receive, send: Send):
+        # 미리 읽은 본문을 앱에 다시 전달하고, 응답은 클라이언트로 보내면서 저장용으로 복사
+        body_sent = False
+        status_code: Optional[int] = None
+        headers: Dict[str, str] = {}
+        chunks: List[bytes] = []
+
+        async def receive_body() -> Message:
+            nonlocal body_sent
+            if not body_sent:
+                body_sent = True
+                return {"type": "http.request", "body": body, "more_body": False}
+            return await receive()
+
+        async def send_copy(message: Message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                for name, value in message.get("headers", []):
+                    if name.lower() != b"content-length":
+                        headers[name.decode("latin-1")] = value.decode("latin-1")
+            elif message["type"] == "http.response.body":
+                chunks.append(message.get("body", b""))
+            await send(message)
+
+        await self.app(scope, receive_body, send_copy)
+        return status_code, headers, chunks
+
+
+async def read_body(receive: Receive) -> Optional[bytes]:
+    """요청 본문 전체 읽기 (클라이언트가 끊으면 None)"""
+    chunks = []
+    while True:
+        message = await receive()
+        if message["type"] == "http.disconnect":
+            return None
+        chunks.append(message.get("body", b""))
+        if not message.get("more_body", False):
+            return b"".join(chunks)
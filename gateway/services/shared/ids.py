@@ -0,0 +1,38 @@
+from contextlib import contextmanager
+from typing import Iterable, Set
+
+
+class IdAllocator:
+    """서비스 단위 id 발급기
+
+    생성 API와 NDJSON 가져오기가 같은 발급기를 써서 id가 겹치지 않도록 합니다.
+    가져오기가 진행 중인 동안 새로 쓰인 id는 recent에 모아 두어,
+    가져오기 시작 시점의 id 목록에 없는 충돌도 찾을 수 있게 합니다.
+    """
+
+    def __init__(self, ids: Iterable[int], first_id: int = 1):
+        last_id = max(ids, default=None)
+        self.next_id = last_id + 1 if last_id is not None else first_id
+        self.recent: Set[int] = set()
+        self._importers = 0
+
+    def allocate(self) -> int:
+        new_id = self.next_id
+        self.claim(new_id)
+        return new_id
+
+    def claim(self, record_id: int):
+        """지정된 id 사용 기록 (이후 발급 id는 이보다 큼)"""
+        self.next_id = max(self.next_id, record_id + 1)
+        if self._importers:
+            self.recent.add(record_id)
+
+    @contextmanager
+    def importing(self):
+        self._importers += 1
+        try:
+            yield
+        finally:
+            self._importers -= 1
+            if not self._importers:
+                self.recent.clear()
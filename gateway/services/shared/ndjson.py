@@ -0,0 +1,113 @@
+import asyncio
+import json
+from typing import Dict, List
+
+from fastapi import Request
+from fastapi.responses import StreamingResponse
+from pydantic import ValidationError
+
+from shared.ids import IdAllocator
+
+
+async def iter_ndjson_lines(request: Request):
+    """요청 본문을 한 줄씩 읽음 (전체를 메모리에 올리지 않음)"""
+    buffer = b""
+    async for chunk in request.stream():
+        buffer += chunk
+        lines = buffer.split(b"\n")
+        buffer = lines.pop()
+        for line in lines:
+            yield line
+    if buffer:
+        yield buffer
+
+
+def export_ndjson(items, chunk_size: int = 1000) -> StreamingResponse:
+    """청크 단위로 직렬화하는 NDJSON 스트리밍 응답"""
+    async def generate():
+        for start in range(0, len(items), chunk_size):
+            chunk = items[start:start + chunk_size]
+            yield "".join(json.dumps(item, ensure_ascii=False) + "\n" for item in chunk)
+    return StreamingResponse(generate(), media_type="application/x-ndjson")
+
+
+def format_validation_error(error: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(map(str, e['loc']))}: {e['msg']}" if e["loc"] else e["msg"]
+        for e in error.errors()
+    )
+
+
+async def import_ndjson(request: Request, items, model, ids: IdAllocator,
+                        chunk_size: int = 1000, max_errors: int = 1000) -> Dict:
+    """NDJSON 대량 가져오기 (배치 단위 검증, 청크 단위 추가, 줄 번호별 오류 보고)
+
+    id가 없는 행은 ids에서 새로 발급받고, 지정된 id는 저장소에 이미 있는 id와
+    가져오는 동안 다른 요청이 쓴 id(ids.recent)를 모두 피합니다. 저장소에 has_id가
+    있으면 그것으로 확인하고, 없으면(dict 리스트) 시작 시점의 id 집합을 만듭니다.
+    """
+    imported = 0
+    failed = 0
+    errors: List[Dict] = []
+    batch: List = []
+
+    def fail(line_no: int, error: str):
+        nonlocal failed
+        failed += 1
+        if len(errors) < max_errors:
+            errors.append({"line": line_no, "error": error})
+
+    with ids.importing():
+        # has_id가 있는 저장소는 별도 id 집합 없이 저장소 자체를 조회
+        known_ids = None if hasattr(items, "has_id") else {item["id"] for item in items}
+
+        def id_exists(record_id: int) -> bool:
+            if record_id in ids.recent:
+                return True
+            return items.has_id(record_id) if known_ids is None else record_id in known_ids
+
+        async def ingest():
+            nonlocal imported
+            for line_no, line in batch:
+                try:
+                    data = model.model_validate_json(line).model_dump(mode="json")
+                except ValidationError as e:
+                    fail(line_no, format_validation_error(e))
+                    continue
+                record_id = data.pop("id")
+                if record_id is None:
+                    record_id = ids.next_id
+                elif id_exists(record_id):
+                    fail(line_no, f"id {record_id} already exists")
+                    continue
+                # 저장소가 담을 수 없는 값(범위 초과 등)도 해당 줄의 오류로 보고
+                try:
+                    items.append({"id": record_id, **data})
+                except (ValueError, TypeError, OverflowError) as e:
+                    fail(line_no, f"cannot store record: {e}")
+                    continue
+                ids.claim(record_id)
+                if known_ids is not None:
+                    known_ids.add(record_id)
+                imported += 1
+            batch.clear()
+            # 다른 요청이 처리될 수 있도록 양보
+            await asyncio.sleep(0)
+
+        line_no = 0
+        async for line in iter_ndjson_lines(request):
+            line_no += 1
+            if not line.strip():
+                continue
+            batch.append((line_no, line))
+            if len(batch) >= chunk_size:
+                await ingest()
+        if batch:
+            await ingest()
+
+    return {
+        "imported": imported,
+        "failed": failed,
+        "errors": errors,
+        "errors_truncated": failed > len(errors)
+    }
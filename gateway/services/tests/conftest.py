@@ -0,0 +1,8 @@
+import os
+import sys
+
+# 서비스 공유 모듈(shared)과 order_store 경로 추가
+SERVICES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir)
+# order-service의 main.py가 게이트웨이 main을 가리지 않도록 뒤에 추가
+sys.path.append(os.path.join(SERVICES_DIR, "order-service"))
+sys.path.insert(0, SERVICES_DIR)
@@ -0,0 +1,121 @@
+import asyncio
+
+import httpx
+import pytest
+from fastapi import FastAPI, Response
+from fastapi.testclient import TestClient
+
+from shared import idempotency
+from shared.idempotency import IdempotencyMiddleware, IdempotencyStore
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(idempotency.time, "monotonic", lambda: now[0])
+    return now
+
+
+def put(store, key):
+    store.put(key, "fp", 200, key.encode(), {})
+
+
+def test_entries_expire_after_ttl(clock):
+    store = IdempotencyStore(ttl=10)
+    put(store, "a")
+    clock[0] += 9
+    assert store.get("a")["body"] == b"a"
+    clock[0] += 2
+    assert store.get("a") is None
+    assert "a" not in store.entries
+
+
+def test_oldest_entries_are_evicted_over_capacity(clock):
+    store = IdempotencyStore(max_entries=2)
+    put(store, "a")
+    put(store, "b")
+    # 다시 저장한 키는 가장 최근 항목이 됨
+    put(store, "a")
+    put(store, "c")
+    assert list(store.entries) == ["a", "c"]
+
+
+def test_expired_entries_are_pruned_on_put(clock):
+    store = IdempotencyStore(ttl=10)
+    put(store, "a")
+    clock[0] += 11
+    put(store, "b")
+    assert list(store.entries) == ["b"]
+
+
+def make_app():
+    app = FastAPI()
+    app.add_middleware(IdempotencyMiddleware, store=IdempotencyStore())
+    calls = []
+
+    @app.post("/items")
+    async def create(body: dict):
+        calls.append(body)
+        await asyncio.sleep(0.02)
+        return {"id": len(calls)}
+
+    @app.get("/items")
+    async def list_items():
+        return calls
+
+    @app.post("/fail")
+    async def fail():
+        calls.append(None)
+        return Response(status_code=503)
+
+    return app, calls
+
+
+def make_client():
+    app, calls = make_app()
+    return TestClient(app), calls
+
+
+def test_middleware_replays_same_key():
+    client, calls = make_client()
+    first = client.post("/items", json={"x": 1}, headers={"Idempotency-Key": "k"})
+    second = client.post("/items", json={"x": 1}, headers={"Idempotency-Key": "k"})
+    assert second.json() == first.json()
+    assert second.headers["idempotent-replayed"] == "true"
+    assert len(calls) == 1
+
+    mismatch = client.post("/items", json={"x": 2}, headers={"Idempotency-Key": "k"})
+    assert mismatch.status_code == 422
+    assert len(calls) == 1
+
+
+def test_middleware_does_not_store_server_errors():
+    client, calls = make_client()
+    client.post("/fail", headers={"Idempotency-Key": "k"})
+    client.post("/fail", headers={"Idempotency-Key": "k"})
+    assert len(calls) == 2
+
+
+def test_concurrent_duplicates_run_once():
+    app, calls = make_app()
+
+    async def scenario():
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+            return await asyncio.gather(*[
+                client.post("/items", json={"x": 1}, headers={"Idempotency-Key": "k"}) for _ in range(5)
+            ])
+
+    responses = asyncio.run(scenario())
+    assert len(calls) == 1
+    assert {response.json()["id"] for response in responses} == {1}
+    replayed = [response for response in responses if response.headers.get("idempotent-replayed") == "true"]
+    assert len(replayed) == 4
+
+
+def test_requests_without_key_or_non_post_pass_through():
+    client, calls = make_client()
+    client.post("/items", json={"x": 1})
+    client.post("/items", json={"x": 1})
+    response = client.get("/items", headers={"Idempotency-Key": "k"})
+    assert len(response.json()) == 2
+    assert "idempotent-replayed" not in response.headers
@@ -0,0 +1,145 @@
+import asyncio
+import json
+from typing import Optional
+
+import httpx
+from fastapi import FastAPI, Request
+from pydantic import BaseModel
+
+from shared.ids import IdAllocator
+from shared.ndjson import import_ndjson
+from order_store import ColumnarOrderStore
+
+
+class ImportItem(BaseModel):
+    id: Optional[int] = None
+    name: str
+
+
+def make_app(items, ids):
+    app = FastAPI()
+
+    @app.post("/items")
+    async def create(body: dict):
+        item = {"id": ids.allocate(), **body}
+        items.append(item)
+        return item
+
+    @app.post("/items/import")
+    async def import_items(request: Request):
+        return await import_ndjson(request, items, ImportItem, ids, chunk_size=2)
+
+    return app
+
+
+def line(**fields) -> bytes:
+    return (json.dumps(fields) + "\n").encode()
+
+
+def test_allocator_skips_claimed_ids():
+    ids = IdAllocator([3, 1], first_id=100)
+    assert ids.allocate() == 4
+    ids.claim(10)
+    assert ids.allocate() == 11
+    assert IdAllocator([], first_id=100).allocate() == 100
+
+
+def test_allocator_tracks_recent_ids_only_while_importing():
+    ids = IdAllocator([])
+    ids.allocate()
+    with ids.importing():
+        created = ids.allocate()
+        assert ids.recent == {created}
+    assert ids.recent == set()
+
+
+def test_create_during_import_does_not_reuse_ids():
+    items = [{"id": 1, "name": "a"}]
+    app = make_app(items, IdAllocator([1]))
+
+    async def scenario():
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+            created = []
+
+            async def body():
+                yield line(name="b") + line(name="c")
+                await asyncio.sleep(0.05)
+                # 가져오는 중에 생성된 id를 지정한 줄은 충돌로 보고
+                yield line(id=4, name="d") + line(name="e")
+
+            async def create_midway():
+                await asyncio.sleep(0.02)
+                response = await client.post("/items", json={"name": "x"})
+                created.append(response.json()["id"])
+
+            response, _ = await asyncio.gather(client.post("/items/import", content=body()), create_midway())
+            return response.json(), created
+
+    result, created = asyncio.run(scenario())
+    assert created == [4]
+    assert result["imported"] == 3
+    assert result["errors"] == [{"line": 3, "error": "id 4 already exists"}]
+    all_ids = [item["id"] for item in items]
+    assert len(all_ids) == len(set(all_ids))
+
+
+def test_rows_the_store_cannot_hold_become_line_errors():
+    items = ColumnarOrderStore()
+    app = FastAPI()
+    ids = IdAllocator([])
+
+    class ImportOrder(BaseModel):
+        id: Optional[int] = None
+        user_id: int
+        product_id: int = 1
+        quantity: int = 1
+        total_price: float = 1.0
+        status: str = "pending"
+        created_at: str = "2024-01-01T00:00:00"
+
+    @app.post("/orders/import")
+    async def import_orders(request: Request):
+        return await import_ndjson(request, items, ImportOrder, ids)
+
+    async def scenario():
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+            body = line(user_id=1) + line(user_id=1, quantity=2 ** 70) + line(user_id=1, created_at="whenever") + line(user_id=2)
+            response = await client.post("/orders/import", content=body)
+            return response.status_code, response.json()
+
+    status_code, result = asyncio.run(scenario())
+    assert status_code == 200
+    assert result["imported"] == 2
+    assert [error["line"] for error in result["errors"]] == [2, 3]
+    assert list(items.ids()) == [1, 2]
+
+
+def test_columnar_import_checks_collisions_against_the_store():
+    items = ColumnarOrderStore([{"id": 1, "user_id": 1, "product_id": 1, "quantity": 1, "total_price": 1.0,
+                                 "status": "pending", "created_at": "2024-01-01T00:00:00"}])
+    app = FastAPI()
+    ids = IdAllocator(items.ids())
+
+    class ImportOrder(BaseModel):
+        id: Optional[int] = None
+        user_id: int
+        product_id: int = 1
+        quantity: int = 1
+        total_price: float = 1.0
+        status: str = "pending"
+        created_at: str = "2024-01-01T00:00:00"
+
+    @app.post("/orders/import")
+    async def import_orders(request: Request):
+        return await import_ndjson(request, items, ImportOrder, ids)
+
+    async def scenario():
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+            body = line(id=1, user_id=1) + line(id=5, user_id=1) + line(id=5, user_id=2) + line(user_id=3)
+            response = await client.post("/orders/import", content=body)
+            return response.json()
+
+    result = asyncio.run(scenario())
+    assert result["imported"] == 2
+    assert result["errors"] == [{"line": 1, "error": "id 1 already exists"}, {"line": 3, "error": "id 5 already exists"}]
+    assert list(items.ids()) == [1, 5, 6]
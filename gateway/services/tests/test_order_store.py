@@ -0,0 +1,106 @@
+import random
+from array import array
+
+import pytest
+
+from order_store import ColumnarOrderStore, ListOrderStore, scan_equal
+
+STATUSES = ["pending", "processing", "shipped", "completed", "cancelled"]
+
+
+def make_orders(count: int, seed: int = 1):
+    rng = random.Random(seed)
+    return [
+        {
+            "id": i,
+            "user_id": rng.randint(1, 20),
+            "product_id": rng.randint(100, 110),
+            "quantity": rng.randint(1, 5),
+            "total_price": float(rng.randint(1, 1000) * 100),
+            "status": rng.choice(STATUSES),
+            "created_at": f"2024-01-{rng.randint(1, 28):02d}T{rng.randint(0, 23):02d}:30:00",
+        }
+        for i in range(1, count + 1)
+    ]
+
+
+@pytest.fixture
+def stores():
+    orders = make_orders(200)
+    return ListOrderStore([dict(o) for o in orders]), ColumnarOrderStore(orders)
+
+
+def test_read_operations_match(stores):
+    rows, columns = stores
+    assert len(rows) == len(columns)
+    assert list(columns) == list(rows)
+    assert columns.all() == rows.all()
+    assert columns[0] == rows[0]
+    assert columns[-1] == rows[-1]
+    assert columns[10:20] == rows[10:20]
+    assert list(columns.ids()) == list(rows.ids())
+    for order_id in (1, 100, 200, 201, 0):
+        assert columns.get(order_id) == rows.get(order_id)
+    for user_id in range(0, 22):
+        assert columns.by_user(user_id) == rows.by_user(user_id)
+
+
+def test_write_operations_match(stores):
+    rows, columns = stores
+    for store in stores:
+        store.append({"id": 500, "user_id": 3, "product_id": 101, "quantity": 1,
+                      "total_price": 10.0, "status": "pending", "created_at": "2024-02-01T00:00:00"})
+        # id가 정렬 순서를 벗어나도 조회 가능해야 함
+        store.append({"id": 250, "user_id": 3, "product_id": 101, "quantity": 1,
+                      "total_price": 10.0, "status": "pending", "created_at": "2024-02-01T00:00:00"})
+        assert store.set_status(250, "shipped")["status"] == "shipped"
+        assert store.set_status(999, "shipped") is None
+        assert store.delete(17)["id"] == 17
+        assert store.delete(17) is None
+
+    assert columns.all() == rows.all()
+    assert columns.get(250) == rows.get(250)
+    assert columns.by_user(3) == rows.by_user(3)
+
+
+def test_failed_append_keeps_columns_aligned():
+    store = ColumnarOrderStore(make_orders(3))
+    with pytest.raises(OverflowError):
+        store.append({"id": 4, "user_id": 1, "product_id": 1, "quantity": 2 ** 70,
+                      "total_price": 1.0, "status": "pending", "created_at": "2024-01-01T00:00:00"})
+    assert {len(column) for column in store._columns()} == {3}
+    assert [order["id"] for order in store] == [1, 2, 3]
+
+
+def test_scan_equal_ignores_unaligned_matches():
+    # 256, 0의 바이트열 안에는 1의 패턴이 원소 경계에 걸쳐 나타남
+    column = array("q", [256, 0, 1, 256, 0, 1])
+    assert column.tobytes().find(array("q", [1]).tobytes()) == 1
+    assert scan_equal(column, 1) == [2, 5]
+    assert scan_equal(column, 256) == [0, 3]
+    assert scan_equal(column, 2 ** 70) == []
+
+
+def test_time_zones_and_integer_prices_round_trip():
+    orders = [
+        {"id": 1, "user_id": 1, "product_id": 101, "quantity": 1, "total_price": 50000,
+         "status": "pending", "created_at": "2024-01-01T00:00:00+09:00"},
+        {"id": 2, "user_id": 1, "product_id": 101, "quantity": 1, "total_price": 50000.0,
+         "status": "pending", "created_at": "2024-01-01T00:00:00Z"},
+        {"id": 3, "user_id": 1, "product_id": 101, "quantity": 1, "total_price": 0.5,
+         "status": "pending", "created_at": "2024-01-01T00:00:00.250000-03:30"},
+        {"id": 4, "user_id": 1, "product_id": 101, "quantity": 1, "total_price": -7,
+         "status": "pending", "created_at": "2024-01-01T00:00:00"},
+    ]
+    rows, columns = ListOrderStore([dict(o) for o in orders]), ColumnarOrderStore(orders)
+    assert columns.all() == rows.all()
+    assert [type(order["total_price"]) for order in columns] == [int, float, float, int]
+    assert columns.get(1)["created_at"] == "2024-01-01T00:00:00+09:00"
+
+
+def test_integer_prices_beyond_double_precision_are_rejected():
+    store = ColumnarOrderStore()
+    with pytest.raises(OverflowError):
+        store.append({"id": 1, "user_id": 1, "product_id": 1, "quantity": 1, "total_price": 2 ** 53 + 1,
+                      "status": "pending", "created_at": "2024-01-01T00:00:00"})
+    assert len(store) == 0
@@ -1,8 +1,16 @@
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Request
 from pydantic import BaseModel
 from typing import List, Optional
 import logging
 import os
+import sys
+
+# 공유 모듈(services/shared) 경로 추가; 컨테이너에서는 /app/shared로 복사됨
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
+from shared.idempotency import IdempotencyMiddleware, IdempotencyStore
+from shared.ids import IdAllocator
+from shared.ndjson import export_ndjson, import_ndjson
 
 # 로깅 설정
 logging.basicConfig(level=logging.INFO)
@@ -15,6 +23,13 @@ app = FastAPI(
     version="1.0.0"
 )
 
+# Idempotency-Key 처리 (재시도로 인한 중복 생성 방지)
+idempotency_store = IdempotencyStore(
+    max_entries=int(os.getenv("IDEMPOTENCY_MAX_KEYS", "10000")),
+    ttl=float(os.getenv("IDEMPOTENCY_TTL_SECONDS", "86400"))
+)
+app.add_middleware(IdempotencyMiddleware, store=idempotency_store)
+
 # 샘플 사용자 데이터
 users = [
     {"id": 1, "name": "김철수", "email": "kim@example.com", "age": 25},
@@ -22,6 +37,9 @@ users = [
     {"id": 3, "name": "박민수", "email": "park@example.com", "age": 28}
 ]
 
+# id 발급기 (생성 API와 NDJSON 가져오기가 함께 사용)
+user_ids = IdAllocator(u["id"] for u in users)
+
 class User(BaseModel):
     id: int
     name: str
@@ -33,6 +51,13 @@ class CreateUser(BaseModel):
     email: str
     age: int
 
+class ImportUser(CreateUser):
+    id: Optional[int] = None
+
+# NDJSON 대량 가져오기/내보내기
+NDJSON_CHUNK_SIZE = int(os.getenv("NDJSON_CHUNK_SIZE", "1000"))
+IMPORT_MAX_ERRORS = int(os.getenv("IMPORT_MAX_ERRORS", "1000"))
+
 @app.get("/health")
 async def health_check():
     """서비스 헬스 체크"""
@@ -52,6 +77,16 @@ async def get_users():
     """모든 사용자 조회"""
     return users
 
+@app.get("/api/users/export")
+async def export_users():
+    """사용자 전체를 NDJSON으로 내보내기"""
+    return export_ndjson(users, NDJSON_CHUNK_SIZE)
+
+@app.post("/api/users/import")
+async def import_users(request: Request):
+    """NDJSON 사용자 대량 가져오기 (id가 없으면 새로 부여)"""
+    return await import_ndjson(request, users, ImportUser, user_ids, NDJSON_CHUNK_SIZE, IMPORT_MAX_ERRORS)
+
 @app.get("/api/users/{user_id}", response_model=User)
 async def get_user(user_id: int):
     """특정 사용자 조회"""
@@ -63,7 +98,7 @@ async def get_user(user_id: int):
 @app.post("/api/users", response_model=User)
 async def create_user(user: CreateUser):
     """새 사용자 생성"""
-    new_id = max([u["id"] for u in users]) + 1 if users else 1
+    new_id = user_ids.allocate()
     new_user = {"id": new_id, **user.dict()}
     users.append(new_user)
     return new_user